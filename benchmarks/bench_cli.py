@@ -0,0 +1,146 @@
+"""
+Headless prompt CLI: records/s over a generated corpus of random configs.
+
+Checks first, on a small corpus:
+  • JSONL file, CSV file and stdin give the same records, in input order,
+    for --workers 1 and --workers N,
+  • every record matches assemble_prompts(cfg, is_sdxl, embeddings=False)
+    computed in this process,
+  • a bad combo value, a malformed JSONL line and a non-object line
+    are reported as error records (the rest still render), exit status 1,
+  • the CLI runs in a child interpreter where torch, comfy and
+    folder_paths cannot be imported,
+then times the full corpus for each worker count.
+
+    python benchmarks/bench_cli.py [--records 50000] [--workers 1,2,4]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from standins import ROOT
+
+sys.path.insert(0, ROOT)
+import character_creator_cli as cli             # noqa: E402
+import character_creator_pro_v10 as node         # noqa: E402
+
+SCRIPT = os.path.join(ROOT, "character_creator_cli.py")
+
+BLOCKED = r"""
+import sys
+class Block:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in ("torch", "comfy", "folder_paths"):
+            raise ImportError(f"{{name}} is blocked")
+sys.meta_path.insert(0, Block())
+sys.path.insert(0, {root!r})
+import character_creator_cli
+sys.exit(character_creator_cli.main())
+"""
+
+
+def make_corpus(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    combos = {k: v for k, v in cli.KINDS.items() if isinstance(v, list)}
+    records = []
+    for i in range(count):
+        r = {k: rng.choice(opts) for k, opts in combos.items()}
+        r.update(id=i, character_name=f"Hero {i}", model=rng.choice(("sd15", "sdxl")))
+        records.append(r)
+    return records
+
+
+def write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def cli_run(args, stdin=None, blocked=False):
+    cmd = [sys.executable]
+    cmd += ["-c", BLOCKED.format(root=ROOT)] if blocked else [SCRIPT]
+    proc = subprocess.run(cmd + args, input=stdin, capture_output=True,
+                          text=True, encoding="utf-8")
+    return proc
+
+
+def read_output(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def checks(tmp, workers):
+    records = make_corpus(400, seed=2)
+    jsonl, csv_path = os.path.join(tmp, "c.jsonl"), os.path.join(tmp, "c.csv")
+    write_jsonl(jsonl, records)
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, sorted(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+    outputs = []
+    for args, stdin in (([jsonl, "--workers", "1"], None),
+                        ([jsonl, "--workers", str(workers), "--chunk-size", "37"], None),
+                        ([csv_path, "--workers", str(workers), "--chunk-size", "37"], None),
+                        (["-", "--workers", "1"], open(jsonl, encoding="utf-8").read())):
+        proc = cli_run(args, stdin)
+        assert proc.returncode == 0, proc.stderr
+        out = read_output(proc.stdout)
+        for r in out:
+            r["id"] = int(r["id"])      # CSV ids arrive as strings
+        outputs.append(out)
+    assert all(o == outputs[0] for o in outputs), "outputs differ between modes"
+    assert [r["index"] for r in outputs[0]] == list(range(len(records)))
+
+    for record, out in zip(records, outputs[0]):
+        cfg = {**cli.DEFAULTS, **{k: v for k, v in record.items() if k not in ("id", "model")}}
+        prompts = node.assemble_prompts(cfg, record["model"] == "sdxl", embeddings=False)
+        assert (out["positive"], out["negative"]) == (prompts.positive, prompts.negative)
+
+    bad = '{"gender": "nope"}\n{}\nnot json\n[1]\n{"id": 4}\n'
+    for w in ("1", str(workers)):
+        proc = cli_run(["-", "--workers", w, "--chunk-size", "2"], bad)
+        out = read_output(proc.stdout)
+        assert proc.returncode == 1, proc.stderr
+        assert [r["index"] for r in out] == [0, 1, 2, 3, 4]
+        assert ["error" in r for r in out] == [True, False, True, True, False], out
+
+    proc = cli_run([jsonl, "--workers", str(workers)], blocked=True)
+    assert proc.returncode == 0, proc.stderr
+    assert read_output(proc.stdout) == [
+        {**r, "id": int(r["id"])} for r in outputs[0]
+    ], "blocked-import run differs"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--records", type=int, default=50000)
+    ap.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    ap.add_argument("--chunk-size", type=int, default=500)
+    args = ap.parse_args()
+    counts = [int(w) for w in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checks(tmp, max(counts + [2]))
+        corpus = os.path.join(tmp, "corpus.jsonl")
+        write_jsonl(corpus, make_corpus(args.records))
+        results = []
+        for workers in counts:
+            proc = cli_run([corpus, "-o", os.devnull, "--workers", str(workers),
+                            "--chunk-size", str(args.chunk_size)])
+            assert proc.returncode == 0, proc.stderr
+            results.append((workers, proc.stderr.strip()))
+
+    print("behaviour checks : ok")
+    print(f"{args.records} records · {os.cpu_count()} CPUs")
+    for workers, line in results:
+        print(f"  workers {workers:>2}: {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+ControlNet hint preparation: HINT_CACHE vs preparing the hint every run.
+
+Checks first:
+  • positive and negative get the same prepared hint, at the output
+    resolution, with control_apply_to_uncond off,
+  • a repeat with the same image is a cache hit with no resize,
+  • an equal-content copy of the image hits (content digest),
+  • another resolution, another ControlNet or an in-place edit misses
+    (the edit on a tensor made outside inference mode — inference
+    tensors have no version counter to notice it),
+  • strength 0 leaves the conditioning untouched,
+  • CharacterCreatorPro reports the hit in its debug output,
+then times apply_character_controlnet() per run, cold vs cached.
+Runs under torch.inference_mode(), as in ComfyUI's executor.
+
+    python benchmarks/bench_controlnet.py [--size 1024] [--runs 20]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import torch
+
+from standins import COUNTERS, StandInCLIP, StandInControlNet, StandInModel, install
+from bench_generate import widget_defaults
+
+
+def conditioning():
+    return [[torch.zeros(1, 77, 768), {"pooled_output": torch.zeros(1, 768)}]]
+
+
+def per_run_ms(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--size", type=int, default=1024, help="pose image side (pixels)")
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir, torch.inference_mode():
+        node = install(models_dir)
+        node.PRESET_STORE = node.PresetStore(os.path.join(models_dir, "presets"))
+        apply = node.apply_character_controlnet
+        cn = StandInControlNet()
+        image = torch.rand(1, args.size, args.size, 3)
+        w, h = 832, 1216
+
+        node.HINT_CACHE.clear()
+        COUNTERS.clear()
+        pos, neg = apply(conditioning(), conditioning(), cn, image, 0.8, w, h)
+        hint = pos[0][1]["control"].cond_hint_original
+        assert neg[0][1]["control"].cond_hint_original is hint
+        assert tuple(hint.shape) == (1, 3, h, w)
+        assert pos[0][1]["control_apply_to_uncond"] is False
+        assert COUNTERS["comfy.utils.common_upscale"] == 1
+
+        COUNTERS.clear()
+        pos, _ = apply(conditioning(), conditioning(), cn, image, 0.8, w, h)
+        assert pos[0][1]["control"].cond_hint_original is hint
+        assert COUNTERS["comfy.utils.common_upscale"] == 0, "hit re-resized"
+        pos, _ = apply(conditioning(), conditioning(), cn, image.clone(), 0.8, w, h)
+        assert pos[0][1]["control"].cond_hint_original is hint, "equal content misses"
+
+        misses = node.HINT_CACHE.misses
+        apply(conditioning(), conditioning(), cn, image, 0.8, h, w)
+        apply(conditioning(), conditioning(), StandInControlNet(), image, 0.8, w, h)
+        with torch.inference_mode(False):
+            edited = image.clone()
+        apply(conditioning(), conditioning(), cn, edited, 0.8, w, h)
+        with torch.inference_mode(False):
+            edited[0, 0, 0, 0] = 2.0
+        apply(conditioning(), conditioning(), cn, edited, 0.8, w, h)
+        assert node.HINT_CACHE.misses - misses == 3, "resolution / ControlNet / edit"
+
+        base = conditioning()
+        assert apply(base, base, cn, image, 0.0, w, h) == (base, base)
+
+        kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), StandInCLIP())
+        kwargs.update(controlnet=cn, controlnet_image=image)
+        gen = node.CharacterCreatorProV10()
+        gen.generate(**kwargs)
+        debug = gen.generate(**kwargs)[-1]
+        assert "hint cached" in debug, debug
+
+        def cold():
+            node.HINT_CACHE.clear()
+            node._IMAGE_DIGESTS.clear()
+            apply(conditioning(), conditioning(), cn, image, 0.8, w, h)
+
+        def warm():
+            apply(conditioning(), conditioning(), cn, image, 0.8, w, h)
+
+        def reloaded():
+            apply(conditioning(), conditioning(), cn, image.clone(), 0.8, w, h)
+
+        cold_ms, warm_ms = per_run_ms(cold, args.runs), per_run_ms(warm, args.runs)
+        reload_ms = per_run_ms(reloaded, args.runs)
+
+    print("behaviour checks : ok")
+    print(f"pose image {args.size}x{args.size} → hint {w}x{h}")
+    print(f"prepare every run        : {cold_ms:8.3f} ms")
+    print(f"cached (same tensor)     : {warm_ms:8.3f} ms")
+    print(f"cached (reloaded image)  : {reload_ms:8.3f} ms  (content digest)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-call cost of the embedding lookup done by every generate():
+the old full rescan of the embeddings folder vs EmbeddingInventory.
+
+    python benchmarks/bench_embeddings.py [--files 3000] [--calls 200]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from standins import install
+
+
+def legacy_get_available_embeddings(folder_paths, known, is_sdxl):
+    """get_available_embeddings() as it was before EmbeddingInventory."""
+    installed = set(folder_paths.get_filename_list("embeddings"))
+    installed_clean = {os.path.splitext(f)[0].lower() for f in installed}
+    data = known["sdxl" if is_sdxl else "sd15"]
+    found_neg = [e for e in data["negative"] if e.lower() in installed_clean]
+    found_pos = [e for e in data["positive"] if e.lower() in installed_clean]
+    return found_pos, found_neg
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--files", type=int, default=3000)
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        node = install(models_dir)
+        emb_dir = os.path.join(models_dir, "embeddings")
+        for i in range(args.files):
+            open(os.path.join(emb_dir, f"filler_{i:05d}.safetensors"), "wb").close()
+        for name in ("EasyNegative.safetensors", "badhandv4.pt", "negativeXL_D.safetensors"):
+            open(os.path.join(emb_dir, name), "wb").close()
+
+        fp = node.folder_paths
+        for is_sdxl in (False, True):
+            assert node.get_available_embeddings(is_sdxl) == \
+                legacy_get_available_embeddings(fp, node.KNOWN_EMBEDDINGS, is_sdxl)
+
+        before = per_call_us(
+            lambda: legacy_get_available_embeddings(fp, node.KNOWN_EMBEDDINGS, False),
+            args.calls,
+        )
+        after = per_call_us(lambda: node.get_available_embeddings(False), args.calls)
+
+        print(f"embeddings folder : {args.files + 3} files")
+        print(f"rescan (before)   : {before:10.1f} µs/call")
+        print(f"inventory (after) : {after:10.1f} µs/call   ({before / after:.0f}x)")
+        print(f"inventory scans   : {node.EMBEDDING_INVENTORY.scans}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Stage-level timings for CharacterCreatorProV10.generate() against the
+local ComfyUI stand-ins (see standins.py).
+
+Each scenario runs the real generate() with the module-level stage
+functions wrapped in timers, so the numbers follow whatever generate()
+does today. Times are exclusive — e.g. "prompt build" does not include
+the embedding scan it triggers.
+
+  stages : preset load · LoRA apply · prompt build · embedding scan ·
+           encode · latent alloc · preset save · other (rest of generate)
+
+"cold" scenarios clear the conditioning / LoRA / patched-pair caches and
+the embedding inventory before every run; "warm" ones repeat an
+identical request.
+
+    python benchmarks/bench_generate.py [--runs 20] [--encode-cost 0.01]
+    python benchmarks/bench_generate.py --json baseline.json
+    python benchmarks/bench_generate.py --compare baseline.json [--tolerance 1.25]
+
+--compare exits with status 1 if any stage's median is slower than
+baseline × tolerance (and by more than --min-delta-ms), so it can gate
+a release.
+
+Every run first checks that a cold generate() makes exactly 2
+clip.encode_from_tokens calls (one positive, one negative) for each
+camera angle in CAMERA_NEGATIVE_TOKENS, SD1.5 and SDXL, and that under
+a token budget the positive and negative conditioning have the same
+sequence length and a warm run tokenizes nothing. It exits with status
+1 otherwise.
+
+Everything runs under torch.inference_mode(), as in ComfyUI's executor.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import torch
+
+from standins import COUNTERS, StandInCLIP, StandInModel, install
+
+STAGES = (
+    ("preset_load",  "load_character_preset"),
+    ("lora_apply",   "apply_lora_stack"),
+    ("prompt_build", "assemble_prompts"),
+    ("embed_scan",   "get_available_embeddings"),
+    ("encode",       "encode_prompt"),
+    ("latent_alloc", "empty_latent"),
+    ("preset_save",  "save_character_preset"),
+)
+
+LORAS = ("style_a.safetensors", "detail_b.safetensors", "face_c.safetensors")
+
+# name, sdxl, cold, widget overrides
+SCENARIOS = (
+    ("sd15 minimal",       False, True,  {}),
+    ("sd15 minimal",       False, False, {}),
+    ("sd15 3 LoRAs",       False, True,  {"loras": 3}),
+    ("sd15 3 LoRAs",       False, False, {"loras": 3}),
+    ("sd15 preset+save",   False, False, {"load_preset": "bench_hero",
+                                          "save_as_name": "bench_copy"}),
+    ("sdxl minimal",       True,  True,  {}),
+    ("sdxl minimal",       True,  False, {}),
+    ("sdxl budget 2",      True,  False, {"token_budget": 2,
+                                          "custom_extra": "ornate filigree armor, " * 12}),
+)
+
+
+class StageClock:
+    """Wraps module functions; accumulates exclusive time per stage."""
+
+    def __init__(self, node):
+        self.totals = dict.fromkeys([s for s, _ in STAGES], 0.0)
+        self._stack = []
+        for stage, attr in STAGES:
+            setattr(node, attr, self._wrap(stage, getattr(node, attr)))
+
+    def _wrap(self, stage, fn):
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                self.totals[stage] += elapsed - nested
+                if self._stack:
+                    self._stack[-1] += elapsed
+        return timed
+
+    def reset(self):
+        for stage in self.totals:
+            self.totals[stage] = 0.0
+
+
+def widget_defaults(node_cls, model, clip):
+    """generate() kwargs from INPUT_TYPES defaults."""
+    kwargs = {}
+    for name, spec in node_cls.INPUT_TYPES()["required"].items():
+        kind = spec[0]
+        opts = spec[1] if len(spec) > 1 else {}
+        if isinstance(kind, (list, tuple)):
+            kwargs[name] = opts.get("default", kind[0])
+        elif "default" in opts:
+            kwargs[name] = opts["default"]
+    kwargs.update(model=model, clip=clip)
+    return kwargs
+
+
+def make_fixtures(node, models_dir, lora_mb, embeddings):
+    lora_dir = os.path.join(models_dir, "loras")
+    for name in LORAS:
+        with open(os.path.join(lora_dir, name), "wb") as f:
+            f.write(os.urandom(lora_mb * 1024 * 1024))
+    emb_dir = os.path.join(models_dir, "embeddings")
+    for i in range(embeddings):
+        open(os.path.join(emb_dir, f"filler_{i:05d}.safetensors"), "wb").close()
+    for name in ("EasyNegative.safetensors", "badhandv4.pt", "negativeXL_D.safetensors"):
+        open(os.path.join(emb_dir, name), "wb").close()
+
+    node.PRESET_STORE = node.PresetStore(os.path.join(models_dir, "presets"))
+    node.PRESET_WRITER = node.PresetWriter(node.PRESET_STORE)
+    hero = dict(node.QUICK_PRESETS["⚔️ Epic Female Warrior"])
+    hero["character_name"] = "Bench Hero"
+    node.PRESET_STORE.save("bench_hero", hero)
+
+
+def clear_caches(node):
+    node.COND_CACHE.clear()
+    node.LORA_CACHE.clear()
+    node.LORA_PAIR_CACHE.clear()
+    node.BUDGET_CACHE.clear()
+    node.EMBEDDING_INVENTORY.refresh()
+
+
+def check_encode_counts(node):
+    """Failures where a cold generate() doesn't encode exactly twice."""
+    angles = node.CharacterCreatorProV10.INPUT_TYPES()["required"]["camera_angle"][0]
+    failures = []
+    for key in node.CAMERA_NEGATIVE_TOKENS:
+        angle = next(a for a in angles if key in a)
+        for sdxl in (False, True):
+            clip = StandInCLIP(sdxl=sdxl, tokenize_cost=0, encode_cost=0)
+            kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), clip)
+            kwargs["camera_angle"] = angle
+            clear_caches(node)
+            COUNTERS.clear()
+            node.CharacterCreatorProV10().generate(**kwargs)
+            encodes = COUNTERS["clip.encode_from_tokens"]
+            if encodes != 2:
+                failures.append(f"  {angle} ({'sdxl' if sdxl else 'sd15'}): "
+                                f"{encodes} encode_from_tokens calls")
+    return failures
+
+
+def check_token_budget(node):
+    """Failures for token-budget padding / caching."""
+    failures = []
+    for sdxl, budget, extra in ((False, 1, {"extra_negative": "blurry, noisy, " * 60}),
+                                (True, 2, {"custom_extra": "ornate filigree armor, " * 12})):
+        clip = StandInCLIP(sdxl=sdxl, tokenize_cost=0, encode_cost=0)
+        kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), clip)
+        kwargs.update(token_budget=budget, **extra)
+        label = f"{'sdxl' if sdxl else 'sd15'} budget {budget}"
+        clear_caches(node)
+        node.BUDGET_CACHE.clear()
+        out = node.CharacterCreatorProV10().generate(**kwargs)
+        pos, neg = out[0][0][0].shape[1], out[1][0][0].shape[1]
+        if pos != neg:
+            failures.append(f"  {label}: positive {pos} tokens, negative {neg}")
+        COUNTERS.clear()
+        node.CharacterCreatorProV10().generate(**kwargs)
+        if COUNTERS["clip.tokenize"]:
+            failures.append(f"  {label} (warm): {COUNTERS['clip.tokenize']} tokenize calls")
+    return failures
+
+
+def run_scenario(node, clock, args, sdxl, cold, overrides):
+    clip = StandInCLIP(sdxl=sdxl, tokenize_cost=args.tokenize_cost,
+                       encode_cost=args.encode_cost)
+    kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), clip)
+    overrides = dict(overrides)
+    for slot in range(1, overrides.pop("loras", 0) + 1):
+        kwargs[f"lora_{slot}"] = LORAS[slot - 1]
+    kwargs.update(overrides)
+
+    gen = node.CharacterCreatorProV10()
+    if not cold:
+        gen.generate(**kwargs)              # warm-up
+
+    samples = {stage: [] for stage in clock.totals}
+    samples["other"], samples["total"] = [], []
+    COUNTERS.clear()
+    for _ in range(args.runs):
+        if cold:
+            clear_caches(node)
+        clock.reset()
+        start = time.perf_counter()
+        gen.generate(**kwargs)
+        total = time.perf_counter() - start
+        for stage, t in clock.totals.items():
+            samples[stage].append(t)
+        samples["other"].append(total - sum(clock.totals.values()))
+        samples["total"].append(total)
+
+    calls = {k: v / args.runs for k, v in COUNTERS.items()}
+    medians = {stage: statistics.median(v) * 1e3 for stage, v in samples.items()}
+    return medians, calls
+
+
+def print_table(results):
+    cols = [s for s, _ in STAGES] + ["other", "total"]
+    head = f"{'scenario':<24}" + "".join(f"{c:>13}" for c in cols)
+    print("median ms per generate()")
+    print(head)
+    print("─" * len(head))
+    for key, res in results.items():
+        print(f"{key:<24}" + "".join(f"{res['ms'][c]:13.3f}" for c in cols))
+    print()
+    print("calls per generate()")
+    for key, res in results.items():
+        calls = ", ".join(
+            f"{k.replace('comfy.', '')}={v:g}" for k, v in sorted(res["calls"].items())
+        )
+        print(f"  {key:<22}: {calls or '—'}")
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for stage, ms in res["ms"].items():
+            old = base["ms"].get(stage)
+            if old is None:
+                continue
+            if ms > old * tolerance and ms - old > min_delta_ms:
+                regressions.append(f"  {key} / {stage}: {old:.3f} → {ms:.3f} ms")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--tokenize-cost", type=float, default=0.0005,
+                    help="seconds per StandInCLIP.tokenize() call")
+    ap.add_argument("--encode-cost", type=float, default=0.01,
+                    help="seconds per encoded 77-token chunk")
+    ap.add_argument("--lora-mb", type=int, default=16, help="size of each LoRA file")
+    ap.add_argument("--embeddings", type=int, default=500,
+                    help="filler files in the embeddings folder")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    ap.add_argument("--tolerance", type=float, default=1.25)
+    ap.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir, torch.inference_mode():
+        node = install(models_dir)
+        make_fixtures(node, models_dir, args.lora_mb, args.embeddings)
+        failures = check_encode_counts(node)
+        if failures:
+            print("❌ cold generate() must encode exactly 2 prompts:")
+            print("\n".join(failures))
+            sys.exit(1)
+        print(f"✅ 2 encodes per cold generate() for all "
+              f"{len(node.CAMERA_NEGATIVE_TOKENS)} camera angles (SD1.5 + SDXL)")
+        failures = check_token_budget(node)
+        if failures:
+            print("❌ token budget:")
+            print("\n".join(failures))
+            sys.exit(1)
+        print("✅ token budget: equal positive / negative length, no warm re-tokenize\n")
+        clock = StageClock(node)
+
+        results = {}
+        for name, sdxl, cold, overrides in SCENARIOS:
+            ms, calls = run_scenario(node, clock, args, sdxl, cold, overrides)
+            key = f"{name} ({'cold' if cold else 'warm'})"
+            results[key] = {"ms": ms, "calls": calls}
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nwrote {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage regression(s) vs {args.compare}:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print(f"\n✅ no stage slower than {args.tolerance}x {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
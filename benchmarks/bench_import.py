@@ -0,0 +1,87 @@
+"""
+Import cost of character_creator_pro_v10, measured in fresh interpreters.
+
+Each run imports the module in a new `python` process with the stdlib
+modules ComfyUI has already loaded (json, hashlib, threading, …)
+pre-imported, so only the node's own cost is timed. Every run also
+checks that the import is side-effect free:
+
+  • folder_paths is not imported (none is installed in the child),
+  • the preset folder (CCP_PRESETS_DIR) is not created,
+  • AGE_GROUPS / ETHNICITIES are not built until first accessed.
+
+    python benchmarks/bench_import.py [--runs 15] [--budget-ms 5]
+
+Exits with status 1 if the median import time exceeds --budget-ms.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from standins import ROOT
+
+CHILD = r"""
+import json, hashlib, threading, time, weakref, collections, os, sys
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import character_creator_pro_v10 as node
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms":            elapsed * 1e3,
+    "folder_paths":  "folder_paths" in sys.modules,
+    "presets_dir":   os.path.exists(os.environ["CCP_PRESETS_DIR"]),
+    "derived_built": "AGE_GROUPS" in vars(node) or "ETHNICITIES" in vars(node),
+    "age_groups":    len(node.AGE_GROUPS),
+}}))
+"""
+
+
+def run_once(presets_dir):
+    env = dict(os.environ, CCP_PRESETS_DIR=presets_dir, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("CCP_RUN_LEDGER", None)
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=ROOT)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=15)
+    ap.add_argument("--budget-ms", type=float, default=5.0)
+    args = ap.parse_args()
+
+    # Compile once so the runs measure import, not bytecode compilation
+    subprocess.run([sys.executable, "-m", "py_compile",
+                    os.path.join(ROOT, "character_creator_pro_v10.py")], check=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        presets_dir = os.path.join(tmp, "ro", "character_presets")
+        results = [run_once(presets_dir) for _ in range(args.runs)]
+
+    for r in results:
+        assert not r["folder_paths"], "folder_paths imported at module load"
+        assert not r["presets_dir"], "preset folder created at module load"
+        assert not r["derived_built"], "derived tables built at module load"
+        assert r["age_groups"] > 0
+
+    times = [r["ms"] for r in results]
+    median = statistics.median(times)
+    print("side effects  : none (folder_paths, preset dir, derived tables)")
+    print(f"import time   : median {median:.2f} ms · min {min(times):.2f} · "
+          f"max {max(times):.2f} ({args.runs} fresh interpreters)")
+    print(f"budget        : {args.budget_ms:.2f} ms")
+    if median > args.budget_ms:
+        print("❌ over budget")
+        sys.exit(1)
+    print("✅ within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+CharacterCreatorProV10.IS_CHANGED: the old hash-everything version vs
+character_fingerprint().
+
+Checks the fingerprint's behaviour first:
+  • stable across MODEL / CLIP objects and save_as_name,
+  • stable when a preset-overridden widget changes,
+  • changes when the stored preset, a selected LoRA file or the set of
+    installed embeddings changes,
+then times both per call.
+
+    python benchmarks/bench_is_changed.py [--calls 20000]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from standins import StandInCLIP, StandInModel, install
+from bench_generate import widget_defaults
+
+
+def legacy_is_changed(*args, **kwargs):
+    """IS_CHANGED as it was: JSON of every argument, objects via str()."""
+    try:
+        state = json.dumps(list(args) + sorted(kwargs.items()), sort_keys=True, default=str)
+    except Exception:
+        state = str(args) + str(kwargs)
+    return hashlib.sha256(state.encode()).hexdigest()
+
+
+def per_call_us(fn, kwargs, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(**kwargs)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--calls", type=int, default=20000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        node = install(models_dir)
+        node.PRESET_STORE = node.PresetStore(os.path.join(models_dir, "presets"))
+        lora_path = os.path.join(models_dir, "loras", "face.safetensors")
+        with open(lora_path, "wb") as f:
+            f.write(b"\0" * 1024)
+        hero = dict(node.QUICK_PRESETS["⚔️ Epic Female Warrior"])
+        node.PRESET_STORE.save("hero", hero)
+
+        cls = node.CharacterCreatorProV10
+        fp = cls.IS_CHANGED
+        base = widget_defaults(cls, StandInModel(), StandInCLIP())
+        base.update(load_preset="hero", lora_1="face.safetensors")
+        first = fp(**base)
+
+        def with_(**kw):
+            return fp(**{**base, **kw})
+
+        assert with_(model=StandInModel(), clip=StandInCLIP()) == first
+        assert with_(save_as_name="copy") == first
+        assert with_(outfit=list(node.OUTFITS)[-1]) == first, "preset overrides outfit"
+        assert with_(base_seed=1) != first
+        assert with_(lora_1_model_str=0.5) != first
+
+        node.PRESET_STORE.save("hero", {**hero, "outfit": list(node.OUTFITS)[-1]})
+        second = fp(**base)
+        assert second != first, "preset content changed"
+
+        st = os.stat(lora_path)
+        os.utime(lora_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        third = fp(**base)
+        assert third != second, "LoRA file changed"
+
+        open(os.path.join(models_dir, "embeddings", "EasyNegative.pt"), "wb").close()
+        os.utime(os.path.join(models_dir, "embeddings"), ns=(0, 10**18))
+        assert fp(**base) != third, "embedding installed"
+        assert fp(**base) == fp(**base)
+
+        widgets = {k: v for k, v in base.items() if k not in ("model", "clip")}
+        old = per_call_us(legacy_is_changed, base, args.calls)
+        new = per_call_us(fp, base, args.calls)
+        no_preset = {**base, "load_preset": "None", "lora_1": "None"}
+        new_plain = per_call_us(fp, no_preset, args.calls)
+        old_widgets = per_call_us(legacy_is_changed, widgets, args.calls)
+
+        print("behaviour checks : ok")
+        print(f"legacy (widgets only)     : {old_widgets:8.1f} µs/call")
+        print(f"legacy (with MODEL/CLIP)  : {old:8.1f} µs/call  (unstable across objects)")
+        print(f"fingerprint (no preset)   : {new_plain:8.1f} µs/call")
+        print(f"fingerprint (preset+LoRA) : {new:8.1f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Merged LoRA stack (apply_lora_stack) vs one apply_lora() per slot.
+
+For 1–3 slots, a LoRA repeated in two slots, and zero-strength sides,
+counts per application:
+
+  clones      model.clone() + clip.clone()
+  file loads  LoRA files read from disk (LoRA cache cleared first)
+  patch sets  add_patches() calls
+
+and checks the merged path's invariants: at most one clone per side,
+one file load per distinct LoRA, no clone for a side whose strengths
+are all 0, and duplicate slots patched once with the summed strength.
+Runs against both the comfy.lora path and the older-ComfyUI fallback
+(which still clones once per distinct LoRA, but never for a zero side).
+
+Also checks LORA_PAIR_CACHE: the same base MODEL / CLIP + stack returns
+the cached pair with no clone or load, a replaced LoRA file misses (in
+LORA_PAIR_CACHE and in the CLIP's conditioning cache identity), and
+comfy.model_management.free_memory() evicts cached pairs (except the
+ones in keep_loaded) only when it actually unloads models.
+
+    python benchmarks/bench_lora_stack.py [--lora-mb 8] [--repeat 20]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import types
+
+from standins import COUNTERS, StandInCLIP, StandInModel, install
+
+LORAS = ("style.safetensors", "detail.safetensors", "face.safetensors")
+
+CASES = (
+    ("1 slot",              [(LORAS[0], 0.8, 0.8)]),
+    ("2 slots",             [(LORAS[0], 0.8, 0.8), (LORAS[1], 0.6, 0.6)]),
+    ("3 slots",             [(LORAS[0], 0.8, 0.8), (LORAS[1], 0.6, 0.6), (LORAS[2], 0.5, 0.5)]),
+    ("3 slots, 1 repeated", [(LORAS[0], 0.8, 0.8), (LORAS[0], 0.2, 0.1), (LORAS[2], 0.5, 0.5)]),
+    ("3 slots, clip str 0", [(LORAS[0], 0.8, 0.0), (LORAS[1], 0.6, 0.0), (LORAS[2], 0.5, 0.0)]),
+    ("model str 0, 1 None", [(LORAS[0], 0.0, 0.8), ("None", 0.6, 0.6), (LORAS[2], 0.0, 0.5)]),
+)
+
+
+def legacy_apply(node, model, clip, stack):
+    """generate() before the merged stack: one load_lora_for_models per slot."""
+    import comfy.sd as comfy_sd
+    for name, ms, cs in stack:
+        if name == "None":
+            continue
+        path = node.folder_paths.get_full_path("loras", name)
+        model, clip = comfy_sd.load_lora_for_models(
+            model, clip, node.load_lora_weights(path), ms, cs
+        )
+    return model, clip
+
+
+def patch_calls(obj):
+    return sum(len(v) for v in obj.patcher.patches.values()) if obj is not None else 0
+
+
+def measure(node, fn, stack):
+    node.LORA_CACHE.clear()
+    COUNTERS.clear()
+    model, clip = StandInModel(), StandInCLIP()
+    new_model, new_clip = fn(node, model, clip, stack)
+    return {
+        "model_clones": COUNTERS["model.clone"],
+        "clip_clones":  COUNTERS["clip.clone"],
+        "loads":        COUNTERS["comfy.utils.load_torch_file"],
+        "patches":      patch_calls(new_model) + patch_calls(new_clip),
+        "model":        new_model, "clip": new_clip,
+        "base":         (model, clip),
+    }
+
+
+def check(node, stack, r, single_clone):
+    merged = node.merge_lora_stack(stack)
+    distinct = {n for n, ms, cs in merged if ms or cs}
+    if single_clone:
+        assert r["model_clones"] <= 1 and r["clip_clones"] <= 1, r
+    else:
+        assert r["model_clones"] <= sum(1 for _, ms, _ in merged if ms), r
+        assert r["clip_clones"] <= sum(1 for _, _, cs in merged if cs), r
+    assert r["loads"] == len(distinct), r
+    if all(ms == 0 for _, ms, _ in merged):
+        assert r["model"] is r["base"][0]
+    if all(cs == 0 for _, _, cs in merged):
+        assert r["clip"] is r["base"][1]
+    for name, ms, cs in merged:
+        for obj, strength in ((r["model"], ms), (r["clip"], r["clip"] is not r["base"][1] and cs)):
+            if not strength:
+                continue
+            applied = [s for patches in obj.patcher.patches.values() for s, _ in patches]
+            assert any(abs(s - strength) < 1e-9 for s in applied), (name, strength, applied)
+
+
+def check_pair_cache(node, stack):
+    """LORA_PAIR_CACHE: hit reuses the pair, file change / memory pressure evict."""
+    import comfy.model_management as mm
+    node.LORA_PAIR_CACHE.clear()
+    model, clip = StandInModel(), StandInCLIP()
+    first = node.apply_lora_stack(model, clip, stack)
+    COUNTERS.clear()
+    again = node.apply_lora_stack(model, clip, list(stack))
+    assert again[0] is first[0] and again[1] is first[1], "cached pair reused"
+    assert not COUNTERS, f"no clone / load on a hit: {dict(COUNTERS)}"
+
+    other = node.apply_lora_stack(model, clip, stack[:1])
+    assert node.apply_lora_stack(model, clip, stack)[0] is first[0], "A → B → A hit"
+    assert node.apply_lora_stack(StandInModel(), clip, stack)[0] is not first[0]
+
+    path = node.folder_paths.get_full_path("loras", stack[0][0])
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    replaced = node.apply_lora_stack(model, clip, stack)
+    assert replaced[0] is not first[0], "file replaced"
+    assert node.clip_identity(replaced[1]) != node.clip_identity(first[1]), \
+        "conditioning cache key must change with the LoRA file"
+
+    # No pressure → nothing evicted; pressure → all but keep_loaded evicted
+    entries = len(node.LORA_PAIR_CACHE)
+    mm.free_memory(0, None)
+    assert len(node.LORA_PAIR_CACHE) == entries
+    mm.evictable = ["unloaded"]
+    mm.free_memory(0, None, keep_loaded=[types.SimpleNamespace(model=other[0])])
+    assert len(node.LORA_PAIR_CACHE) == 1
+    mm.unload_all_models()
+    assert len(node.LORA_PAIR_CACHE) == 0
+
+
+def run(node, args, label, single_clone):
+    def stack_fn(n, model, clip, stack):
+        return n.apply_lora_stack(model, clip, stack, use_cache=False)
+
+    print(f"── {label}")
+    print(f"{'case':<22}{'clones':>14}{'file loads':>14}{'patch sets':>14}{'ms/apply':>18}")
+    for name, stack in CASES:
+        old = measure(node, legacy_apply, stack)
+        new = measure(node, stack_fn, stack)
+        check(node, stack, new, single_clone)
+        timings = []
+        for fn in (legacy_apply, stack_fn):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                fn(node, StandInModel(), StandInCLIP(), stack)
+            timings.append((time.perf_counter() - start) / args.repeat * 1e3)
+
+        def pair(key):
+            return f"{old[key]} → {new[key]}"
+        clones = f"{old['model_clones'] + old['clip_clones']} → {new['model_clones'] + new['clip_clones']}"
+        print(f"{name:<22}{clones:>14}{pair('loads'):>14}{pair('patches'):>14}"
+              f"{timings[0]:8.3f} → {timings[1]:.3f}")
+
+    stack = CASES[2][1]
+    check_pair_cache(node, stack)
+    model, clip = StandInModel(), StandInCLIP()
+    node.apply_lora_stack(model, clip, stack)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        node.apply_lora_stack(model, clip, stack)
+    hit_ms = (time.perf_counter() - start) / args.repeat * 1e3
+    print(f"{'3 slots, pair cached':<22}{'0':>14}{'0':>14}{'0':>14}{hit_ms:18.3f}")
+    print()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--lora-mb", type=int, default=8)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        for with_lora_module, label in ((True, "comfy.lora (single clone)"),
+                                        (False, "fallback: load_lora_for_models per LoRA")):
+            node = install(models_dir, with_lora_module=with_lora_module)
+            for name in LORAS:
+                path = os.path.join(models_dir, "loras", name)
+                if not os.path.exists(path):
+                    with open(path, "wb") as f:
+                        f.write(os.urandom(args.lora_mb * 2**20))
+            run(node, args, label, single_clone=with_lora_module)
+    print("checks : ok (≤1 clone per side, 1 load per distinct LoRA, zero sides untouched, "
+          "pair cache hit / miss / eviction)")
+
+
+if __name__ == "__main__":
+    main()
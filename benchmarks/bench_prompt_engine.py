@@ -0,0 +1,122 @@
+"""
+CompiledPromptEngine vs the reference prompt builders.
+
+Checks that the engine produces identical positive blocks, positive and
+negative text, and that its on-demand memos stay within
+CCP_PROMPT_MEMO_ENTRIES under unbounded weight variety, then times both
+over the same configs:
+
+  • the full cartesian product of the tables that interact
+    (gender × age × ethnicity × hair colour × eye colour) across lock
+    strengths — every other table only feeds its own block,
+  • every key of every remaining table,
+  • random configs with custom text and unknown keys.
+
+    python benchmarks/bench_prompt_engine.py [--random 50000]
+"""
+
+import argparse
+import itertools
+import random
+import tempfile
+import time
+
+from standins import install
+
+
+def build_configs(node, n_random, seed=0):
+    rnd = random.Random(seed)
+    tables = {
+        "quality_preset": node.QUALITY_PRESETS, "art_style":  node.ART_STYLES,
+        "gender":         node.GENDER_DATA,     "age_group":  node.AGE_DATA,
+        "body_type":      node.BODY_TYPES,      "ethnicity":  node.ETHNICITY_DATA,
+        "hair_style":     node.HAIR_STYLES,     "hair_color": node.HAIR_COLORS,
+        "eye_style":      node.EYE_STYLES,      "eye_color":  node.EYE_COLORS,
+        "archetype":      node.ARCHETYPES,      "expression": node.EXPRESSIONS,
+        "outfit":         node.OUTFITS,         "lighting":   node.LIGHTING,
+        "camera_angle":   node.CAMERA_ANGLES,   "background": node.BACKGROUNDS,
+    }
+    configs = []
+
+    interacting = ("gender", "age_group", "ethnicity", "hair_color", "eye_color")
+    for i, combo in enumerate(itertools.product(*(tables[t] for t in interacting))):
+        cfg = dict(zip(interacting, combo))
+        cfg["gender_lock_strength"] = (1.0, 1.2, 1.55, 2.0)[i % 4]
+        configs.append(cfg)
+
+    for table, values in tables.items():
+        if table in interacting:
+            continue
+        for key in values:
+            cfg = {t: rnd.choice(list(v)) for t, v in tables.items()}
+            cfg[table] = key
+            configs.append(cfg)
+
+    extras = ["", "  ", "battle scars, (glowing tattoo:1.2)", " hood "]
+    for _ in range(n_random):
+        cfg = {
+            t: rnd.choice(list(v) + ["unknown key"])
+            for t, v in tables.items() if rnd.random() < 0.95
+        }
+        for key in ("custom_facial", "custom_outfit_extra", "custom_extra", "extra_negative"):
+            if rnd.random() < 0.4:
+                cfg[key] = rnd.choice(extras)
+        if rnd.random() < 0.7:
+            cfg["gender_lock_strength"] = round(rnd.uniform(1.0, 2.0) / 0.05) * 0.05
+        if rnd.random() < 0.7:
+            cfg["art_style_weight"] = round(rnd.uniform(0.8, 1.8) / 0.05) * 0.05
+        configs.append(cfg)
+    return configs
+
+
+def timed(fn, configs):
+    start = time.perf_counter()
+    for cfg in configs:
+        fn(cfg)
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--random", type=int, default=50000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        node = install(models_dir)
+        engine = node.CompiledPromptEngine()
+        configs = build_configs(node, args.random)
+
+        start = time.perf_counter()
+        engine.compile()
+        compile_s = time.perf_counter() - start
+
+        for cfg in configs:
+            assert engine.positive_blocks(cfg) == node.build_positive_blocks(cfg), cfg
+            assert engine.positive(cfg) == node.build_positive_prompt(cfg), cfg
+            assert engine.negative(cfg) == node.build_negative_prompt(cfg), cfg
+
+        # Fresh float weights on every config must not grow the memos
+        memos = (engine._style, engine._gender, engine._tail, engine._hair, engine._eyes)
+        rnd = random.Random(1)
+        for i in range(3 * memos[0].max_entries):
+            cfg = dict(configs[i % len(configs)],
+                       gender_lock_strength=rnd.uniform(1.0, 2.0),
+                       art_style_weight=rnd.uniform(0.8, 1.8),
+                       hair_style=f"free text {i}")
+            engine.positive(cfg)
+        assert all(len(m) <= m.max_entries for m in memos), [len(m) for m in memos]
+
+        ref_s = timed(lambda c: (node.build_positive_prompt(c),
+                                 node.build_negative_prompt(c)), configs)
+        eng_s = timed(lambda c: (engine.positive(c), engine.negative(c)), configs)
+
+        n = len(configs)
+        print(f"configs checked : {n} (identical output, memos bounded)")
+        print(f"engine compile  : {compile_s * 1e3:8.1f} ms (once)")
+        print(f"reference       : {ref_s / n * 1e6:8.2f} µs/config  {n / ref_s:10.0f} configs/s")
+        print(f"compiled engine : {eng_s / n * 1e6:8.2f} µs/config  {n / eng_s:10.0f} configs/s"
+              f"  ({ref_s / eng_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Character Roster: text-side time per queued job with and without the
+background prefetch of the next character.
+
+Each job runs what precedes sampling on the text side — Roster (preset
+load) → LoRA stack (file reads) → prompt build (embedding scan) — then
+sleeps --sample-ms to stand in for the sampler. Every character has
+its own preset and LoRA file, so nothing is warm unless prefetched.
+
+Checks first: cursor order and wrap-around, start_index, filter terms
+(column=value and name globs), IS_CHANGED always re-running, and that
+the next character's preset and LoRA are cached before its job starts,
+also for presets saved by Character Creator Pro with a LoRA slot set,
+and that a stalled prefetch delays the next job by at most
+ROSTER_WAIT_S.
+
+    python benchmarks/bench_roster.py [--characters 12] [--lora-mb 32] [--sample-ms 300]
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import tempfile
+import time
+
+from standins import COUNTERS, StandInCLIP, StandInModel, install
+from bench_generate import widget_defaults
+
+
+def make_roster(node, models_dir, prefix, count, lora_mb):
+    node.PRESET_STORE = node.PresetStore(os.path.join(models_dir, f"presets_{prefix}"))
+    base = dict(node.QUICK_PRESETS["⚔️ Epic Female Warrior"])
+    for i in range(count):
+        lora = f"{prefix}_{i:03d}.safetensors"
+        with open(os.path.join(models_dir, "loras", lora), "wb") as f:
+            f.write(os.urandom(lora_mb * 2**20))
+        node.PRESET_STORE.save(f"{prefix}_{i:03d}", {
+            **base, "character_name": f"{prefix} {i}", "loras": [[lora, 0.8, 0.8]],
+        })
+    # Reopen so no preset is in the store's memory cache
+    node.PRESET_STORE = node.PresetStore(os.path.join(models_dir, f"presets_{prefix}"))
+    node.LORA_CACHE.clear()
+    node.EMBEDDING_INVENTORY.refresh()
+
+
+def run_jobs(node, prefix, count, sample_s, prefetch):
+    roster = node.CharacterRosterV1()
+    clip, model = StandInCLIP(), StandInModel()
+    real_prefetch = node.ROSTER_PREFETCHER.prefetch
+    if not prefetch:
+        node.ROSTER_PREFETCHER.prefetch = lambda entry: None
+    text_side = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            cfg, stack, *_ = roster.next_character("", "", f"{prefix}_*", 0, 42, True)
+            node.apply_lora_stack(model, clip, stack, use_cache=False)
+            node.assemble_prompts(cfg, False)
+            text_side.append(time.perf_counter() - start)
+            time.sleep(sample_s)
+    finally:
+        node.ROSTER_PREFETCHER.prefetch = real_prefetch
+    return text_side
+
+
+def checks(node, models_dir):
+    make_roster(node, models_dir, "chk", 3, 1)
+    roster = node.CharacterRosterV1()
+
+    def step(**kw):
+        args = dict(presets="", characters_json="", roster_filter="chk_*",
+                    start_index=0, base_seed=42, use_char_seed=True)
+        args.update(kw)
+        return roster.next_character(**args)
+
+    names = [step()[3] for _ in range(4)]
+    assert names == ["chk 0", "chk 1", "chk 2", "chk 0"], names
+    assert step(start_index=2)[4] == 2, "start_index resets the cursor"
+    assert step(presets="chk_001\nchk_002", roster_filter="")[5] == 2
+    assert step(roster_filter="gender=👩 Female; chk_00[12]")[5] == 2
+    assert math.isnan(node.CharacterRosterV1.IS_CHANGED())
+
+    node.ROSTER_PREFETCHER.wait()
+    make_roster(node, models_dir, "pf", 2, 1)
+    step(roster_filter="pf_*")
+    assert node.ROSTER_PREFETCHER.wait(timeout=10)
+    path = node.folder_paths.get_full_path("loras", "pf_001.safetensors")
+    assert any(k[0] == path for k in node.LORA_CACHE.keys()), "next LoRA not prefetched"
+    assert "pf_001" in node.PRESET_STORE._cache, "next preset not prefetched"
+
+    # Presets saved from the main node carry their LoRA slots
+    node.PRESET_WRITER = node.PresetWriter(node.PRESET_STORE)
+    gen = node.CharacterCreatorProV10()
+    kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), StandInCLIP())
+    for i in range(2):
+        gen.generate(**{**kwargs, "character_name": f"saved {i}",
+                        "save_as_name": f"saved_{i:03d}",
+                        "lora_1": f"pf_{i:03d}.safetensors"})
+    node.PRESET_WRITER.flush()
+    node.LORA_CACHE.clear()
+    _, stack, *_ = step(roster_filter="saved_*")
+    assert stack == [("pf_000.safetensors", 0.8, 0.8)], stack
+    assert node.ROSTER_PREFETCHER.wait(timeout=10)
+    path = node.folder_paths.get_full_path("loras", "pf_001.safetensors")
+    assert any(k[0] == path for k in node.LORA_CACHE.keys()), "saved preset LoRA not prefetched"
+    override = json.dumps([{"preset": "saved_000", "loras": [["pf_001.safetensors", 1, 1]]}])
+    _, stack, *_ = step(characters_json=override, roster_filter="")
+    assert stack == [("pf_001.safetensors", 1.0, 1.0)], stack
+    node.ROSTER_PREFETCHER.wait()
+
+    # A stalled prefetch (slow disk) must not hold up the next job
+    real_warm = node.ROSTER_PREFETCHER._warm
+    node.ROSTER_PREFETCHER._warm = lambda entry: time.sleep(2)
+    try:
+        step(roster_filter="pf_*")
+        start = time.perf_counter()
+        step(roster_filter="pf_*")
+        waited = time.perf_counter() - start
+        assert waited < node.ROSTER_WAIT_S + 0.5, f"blocked {waited:.2f}s on prefetch"
+    finally:
+        node.ROSTER_PREFETCHER.wait()
+        node.ROSTER_PREFETCHER._warm = real_warm
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--characters", type=int, default=12)
+    ap.add_argument("--lora-mb", type=int, default=32)
+    ap.add_argument("--sample-ms", type=float, default=300)
+    ap.add_argument("--embeddings", type=int, default=2000,
+                    help="filler files in the embeddings folder")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        node = install(models_dir)
+        emb_dir = os.path.join(models_dir, "embeddings")
+        for i in range(args.embeddings):
+            open(os.path.join(emb_dir, f"filler_{i:05d}.pt"), "wb").close()
+        checks(node, models_dir)
+
+        results = {}
+        for label, prefetch in (("no prefetch", False), ("prefetch", True)):
+            prefix = label.replace(" ", "")
+            make_roster(node, models_dir, prefix, args.characters, args.lora_mb)
+            COUNTERS.clear()
+            times = run_jobs(node, prefix, args.characters, args.sample_ms / 1e3, prefetch)
+            node.ROSTER_PREFETCHER.wait()
+            results[label] = times
+
+    print("behaviour checks : ok")
+    print(f"{args.characters} characters · {args.lora_mb} MB LoRA each · "
+          f"{args.sample_ms:g} ms sampling stand-in")
+    for label, times in results.items():
+        later = times[1:]
+        print(f"  {label:<12}: first job {times[0] * 1e3:8.2f} ms · "
+              f"later jobs median {statistics.median(later) * 1e3:8.2f} ms (text side)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Character Series: one execution for N images vs one queue entry per image.
+
+Checks first:
+  • series_seeds() is deterministic and starts with the DNA seed,
+  • the latent is [N, C, h, w], the conditioning is broadcast to N as
+    views of the encoded tensors (no re-encode, no copy),
+  • NOISE item i equals the noise of a single-image run with seeds[i],
+then times N × generate() (one queue entry per image, a new seed each)
+against generate() + CharacterSeries. Runs under torch.inference_mode(),
+as in ComfyUI's executor.
+
+    python benchmarks/bench_series.py [--size 16] [--runs 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import torch
+
+from standins import COUNTERS, StandInCLIP, StandInModel, install
+from bench_generate import widget_defaults
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--size", type=int, default=16, help="images in the series")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--encode-cost", type=float, default=0.01,
+                    help="seconds per encoded 77-token chunk")
+    args = ap.parse_args()
+    n = args.size
+
+    with tempfile.TemporaryDirectory() as models_dir, torch.inference_mode():
+        node = install(models_dir)
+        import comfy.sample
+
+        clip = StandInCLIP(encode_cost=args.encode_cost)
+        kwargs = widget_defaults(node.CharacterCreatorProV10, StandInModel(), clip)
+        kwargs["character_name"] = "Series Hero"
+        gen, series = node.CharacterCreatorProV10(), node.CharacterSeriesV1()
+
+        out = gen.generate(**kwargs)
+        positive, negative, latent, seed = out[0], out[1], out[4], out[7]
+        s_pos, s_neg, s_latent, noise, seeds, seed_list = series.series(
+            positive, negative, latent, seed, n
+        )
+        assert seeds == node.series_seeds(seed, n) and seeds[0] == seed
+        assert len(set(seeds)) == n and seed_list.split(", ")[0] == str(seed)
+        assert s_latent["samples"].shape[0] == n
+        assert s_latent["samples"].shape[1:] == latent["samples"].shape[1:]
+        for before, after in ((positive, s_pos), (negative, s_neg)):
+            assert after[0][0].shape[0] == n
+            assert after[0][0].data_ptr() == before[0][0].data_ptr(), "copied"
+        batch_noise = noise.generate_noise(s_latent)
+        for i in (0, n // 2, n - 1):
+            single = comfy.sample.prepare_noise(latent["samples"][:1], seeds[i])
+            assert torch.equal(batch_noise[i:i + 1], single), f"image {i} not reproducible"
+
+        node.COND_CACHE.clear()
+
+        def per_image():
+            COUNTERS.clear()
+            for s in range(n):
+                gen.generate(**{**kwargs, "base_seed": s})
+            return dict(COUNTERS)
+
+        def one_series():
+            COUNTERS.clear()
+            o = gen.generate(**kwargs)
+            series.series(o[0], o[1], o[4], o[7], n)
+            return dict(COUNTERS)
+
+        timings = {}
+        for label, fn in (("per image", per_image), ("series", one_series)):
+            samples = []
+            for _ in range(args.runs):
+                node.COND_CACHE.clear()
+                start = time.perf_counter()
+                calls = fn()
+                samples.append(time.perf_counter() - start)
+            timings[label] = (statistics.median(samples) * 1e3, calls)
+
+    print("behaviour checks : ok")
+    print(f"{n} images of one character, cold conditioning cache")
+    for label, (ms, calls) in timings.items():
+        encodes = calls.get("clip.encode_from_tokens", 0)
+        executions = n if label == "per image" else 1
+        print(f"  {label:<10}: {ms:9.2f} ms · {executions:>2} executions · "
+              f"{encodes} encodes · {executions} sampler calls")
+
+
+if __name__ == "__main__":
+    main()
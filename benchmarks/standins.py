@@ -0,0 +1,331 @@
+"""
+Local stand-ins for the ComfyUI modules character_creator_pro_v10 imports,
+so the node can be benchmarked outside a live ComfyUI.
+
+    from standins import install, StandInCLIP, StandInModel
+    node = install(models_dir)      # → imported character_creator_pro_v10
+    clip = StandInCLIP(sdxl=False, encode_cost=0.02)
+
+Only the calls the node makes are implemented:
+
+  folder_paths          get_folder_paths / get_filename_list / get_full_path
+                        (lists the folder on every call — no filename cache,
+                        the worst case on network storage)
+  comfy.sd              load_lora_for_models
+  comfy.lora            model_lora_keys_unet / model_lora_keys_clip / load_lora
+  comfy.utils           load_torch_file (reads the whole file) / common_upscale
+  comfy.sample          prepare_noise (same generator use as ComfyUI)
+  comfy.model_management  intermediate_device / get_torch_device /
+                          free_memory / unload_all_models
+
+StandInControlNet mimics ComfyUI's ControlNet copy / set_cond_hint chain.
+StandInCLIP tokenizes like ComfyUI (dict of 77-token chunks per encoder)
+and sleeps a configurable time per tokenize call and per encoded chunk,
+so stage timings are deterministic. Every stand-in counts its calls in
+COUNTERS.
+"""
+
+import os
+import sys
+import time
+import types
+import uuid
+import zlib
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COUNTERS = Counter()
+
+START_TOKEN, END_TOKEN, CHUNK = 49406, 49407, 77
+
+
+# ═══════════════════════════════════════════════════════════
+#  folder_paths
+# ═══════════════════════════════════════════════════════════
+
+def make_folder_paths(models_dir: str) -> types.ModuleType:
+    fp = types.ModuleType("folder_paths")
+    fp.models_dir = models_dir
+
+    def get_folder_paths(folder_name):
+        return [os.path.join(models_dir, folder_name)]
+
+    def get_filename_list(folder_name):
+        COUNTERS["folder_paths.get_filename_list"] += 1
+        base = os.path.join(models_dir, folder_name)
+        names = []
+        for dirpath, _, files in os.walk(base):
+            rel = os.path.relpath(dirpath, base)
+            for f in files:
+                names.append(f if rel == "." else f"{rel}/{f}".replace(os.sep, "/"))
+        return sorted(names)
+
+    def get_full_path(folder_name, filename):
+        path = os.path.join(models_dir, folder_name, filename)
+        return path if os.path.isfile(path) else None
+
+    fp.get_folder_paths  = get_folder_paths
+    fp.get_filename_list = get_filename_list
+    fp.get_full_path     = get_full_path
+    return fp
+
+
+# ═══════════════════════════════════════════════════════════
+#  comfy.*
+# ═══════════════════════════════════════════════════════════
+
+class StandInPatcher:
+    def __init__(self):
+        self.patches = {}
+        self.patches_uuid = uuid.uuid4()
+
+    def clone(self):
+        n = StandInPatcher()
+        n.patches = dict(self.patches)
+        n.patches_uuid = self.patches_uuid
+        return n
+
+    def add_patches(self, patches, strength=1.0):
+        for key, value in patches.items():
+            self.patches.setdefault(key, []).append((strength, value))
+        self.patches_uuid = uuid.uuid4()
+        return list(patches)
+
+
+class StandInModel:
+    """MODEL stand-in: a patcher around a shared 'weights' object."""
+
+    def __init__(self, model=None, patcher=None):
+        self.model   = model if model is not None else object()
+        self.patcher = patcher or StandInPatcher()
+
+    @property
+    def patches_uuid(self):
+        return self.patcher.patches_uuid
+
+    def clone(self):
+        COUNTERS["model.clone"] += 1
+        return StandInModel(self.model, self.patcher.clone())
+
+    def add_patches(self, patches, strength=1.0):
+        return self.patcher.add_patches(patches, strength)
+
+
+class StandInControlNet:
+    """CONTROL_NET stand-in: copy / set_cond_hint / set_previous_controlnet."""
+
+    upscale_algorithm = "nearest-exact"
+
+    def __init__(self):
+        self.cond_hint_original = None
+        self.strength = 1.0
+        self.previous_controlnet = None
+
+    def copy(self):
+        COUNTERS["controlnet.copy"] += 1
+        return StandInControlNet()
+
+    def set_cond_hint(self, cond_hint, strength=1.0, timestep_percent_range=(0.0, 1.0), vae=None):
+        self.cond_hint_original = cond_hint
+        self.strength = strength
+        return self
+
+    def set_previous_controlnet(self, controlnet):
+        self.previous_controlnet = controlnet
+        return self
+
+
+class _Tokenizer:
+    pass
+
+
+class _TextEncoder:
+    pass
+
+
+class StandInCLIP:
+    """
+    CLIP stand-in with ComfyUI's tokenize / encode_from_tokens contract.
+    tokenize_cost: seconds per tokenize() call
+    encode_cost:   seconds per encoded 77-token chunk
+    """
+
+    def __init__(self, sdxl=False, tokenize_cost=0.0005, encode_cost=0.01):
+        self.sdxl             = sdxl
+        self.tokenize_cost    = tokenize_cost
+        self.encode_cost      = encode_cost
+        self.tokenizer        = _Tokenizer()
+        self.cond_stage_model = _TextEncoder()
+        self.patcher          = StandInPatcher()
+        self.layer_idx        = None
+
+    def clone(self):
+        COUNTERS["clip.clone"] += 1
+        n = StandInCLIP.__new__(StandInCLIP)
+        n.__dict__.update(self.__dict__)
+        n.patcher = self.patcher.clone()
+        return n
+
+    def add_patches(self, patches, strength_patch=1.0, strength_model=1.0):
+        return self.patcher.add_patches(patches, strength_patch)
+
+    def _chunks(self, text, pad_token):
+        words = text.replace(",", " , ").split()
+        chunks, cur = [], [(START_TOKEN, 1.0)]
+        for word in words:
+            if len(cur) == CHUNK - 1:
+                chunks.append(cur + [(END_TOKEN, 1.0)])
+                cur = [(START_TOKEN, 1.0)]
+            cur.append((zlib.crc32(word.encode()) % 49000, 1.0))
+        cur.append((END_TOKEN, 1.0))
+        cur += [(pad_token, 1.0)] * (CHUNK - len(cur))
+        chunks.append(cur)
+        return chunks
+
+    def tokenize(self, text):
+        COUNTERS["clip.tokenize"] += 1
+        time.sleep(self.tokenize_cost)
+        if self.sdxl:
+            return {"g": self._chunks(text, 0), "l": self._chunks(text, END_TOKEN)}
+        return {"l": self._chunks(text, END_TOKEN)}
+
+    def encode_from_tokens(self, tokens, return_pooled=False):
+        import torch
+        COUNTERS["clip.encode_from_tokens"] += 1
+        chunks = len(next(iter(tokens.values())))
+        COUNTERS["clip.encoded_chunks"] += chunks
+        time.sleep(self.encode_cost * chunks)
+        dim = 2048 if self.sdxl else 768
+        cond = torch.zeros([1, CHUNK * chunks, dim])
+        pooled = torch.zeros([1, 1280 if self.sdxl else 768])
+        return (cond, pooled) if return_pooled else cond
+
+
+def make_comfy(with_lora_module: bool = True) -> dict:
+    comfy = types.ModuleType("comfy")
+    comfy.__path__ = []
+
+    sd = types.ModuleType("comfy.sd")
+
+    def load_lora_for_models(model, clip, lora, strength_model, strength_clip):
+        COUNTERS["comfy.sd.load_lora_for_models"] += 1
+        new_model = model.clone() if model is not None else None
+        if new_model is not None:
+            new_model.add_patches(lora, strength_model)
+        new_clip = clip.clone() if clip is not None else None
+        if new_clip is not None:
+            new_clip.add_patches(lora, strength_clip)
+        return (new_model, new_clip)
+
+    sd.load_lora_for_models = load_lora_for_models
+
+    utils = types.ModuleType("comfy.utils")
+
+    def load_torch_file(path, safe_load=False):
+        import torch
+        COUNTERS["comfy.utils.load_torch_file"] += 1
+        with open(path, "rb") as f:
+            data = bytearray(f.read())
+        return {"lora.weight": torch.frombuffer(data, dtype=torch.uint8)}
+
+    def common_upscale(samples, width, height, upscale_method, crop):
+        import torch
+        COUNTERS["comfy.utils.common_upscale"] += 1
+        if crop == "center":
+            old_w, old_h = samples.shape[-1], samples.shape[-2]
+            old_aspect, new_aspect = old_w / old_h, width / height
+            x = y = 0
+            if old_aspect > new_aspect:
+                x = round((old_w - old_w * (new_aspect / old_aspect)) / 2)
+            elif old_aspect < new_aspect:
+                y = round((old_h - old_h * (old_aspect / new_aspect)) / 2)
+            samples = samples.narrow(-2, y, old_h - y * 2).narrow(-1, x, old_w - x * 2)
+        return torch.nn.functional.interpolate(samples, size=(height, width), mode=upscale_method)
+
+    utils.load_torch_file = load_torch_file
+    utils.common_upscale = common_upscale
+
+    mm = types.ModuleType("comfy.model_management")
+
+    def intermediate_device():
+        import torch
+        return torch.device("cpu")
+
+    def get_torch_device():
+        import torch
+        return torch.device("cpu")
+
+    def free_memory(memory_required, device, keep_loaded=()):
+        """Unloads (and returns) everything in mm.evictable — set it to simulate pressure."""
+        COUNTERS["model_management.free_memory"] += 1
+        unloaded, mm.evictable = list(mm.evictable), []
+        return unloaded
+
+    def unload_all_models():
+        COUNTERS["model_management.unload_all_models"] += 1
+
+    mm.intermediate_device = intermediate_device
+    mm.get_torch_device = get_torch_device
+    mm.free_memory = free_memory
+    mm.unload_all_models = unload_all_models
+    mm.evictable = []
+    mm.current_loaded_models = []
+
+    sample = types.ModuleType("comfy.sample")
+
+    def prepare_noise(latent_image, seed, noise_inds=None):
+        import torch
+        generator = torch.manual_seed(seed)
+        return torch.randn(latent_image.size(), dtype=latent_image.dtype,
+                           layout=latent_image.layout, generator=generator, device="cpu")
+
+    sample.prepare_noise = prepare_noise
+
+    comfy.sd, comfy.utils, comfy.model_management = sd, utils, mm
+    comfy.sample = sample
+    modules = {"comfy": comfy, "comfy.sd": sd, "comfy.utils": utils,
+               "comfy.model_management": mm, "comfy.sample": sample}
+
+    if with_lora_module:
+        lora_mod = types.ModuleType("comfy.lora")
+
+        def model_lora_keys_unet(model, key_map={}):
+            key_map["lora.weight"] = "diffusion_model.weight"
+            return key_map
+
+        def model_lora_keys_clip(model, key_map={}):
+            key_map["lora.weight"] = "clip.weight"
+            return key_map
+
+        def load_lora(lora, to_load):
+            COUNTERS["comfy.lora.load_lora"] += 1
+            return {to_load.get(k, k): ("lora", v) for k, v in lora.items()}
+
+        lora_mod.model_lora_keys_unet = model_lora_keys_unet
+        lora_mod.model_lora_keys_clip = model_lora_keys_clip
+        lora_mod.load_lora = load_lora
+        comfy.lora = lora_mod
+        modules["comfy.lora"] = lora_mod
+    return modules
+
+
+# ═══════════════════════════════════════════════════════════
+#  install
+# ═══════════════════════════════════════════════════════════
+
+def install(models_dir: str, with_lora_module: bool = True):
+    """
+    Register the stand-ins and import the node module against them.
+    with_lora_module=False leaves out comfy.lora (older ComfyUI).
+    """
+    for folder in ("loras", "embeddings"):
+        os.makedirs(os.path.join(models_dir, folder), exist_ok=True)
+    sys.modules["folder_paths"] = make_folder_paths(models_dir)
+    for name in [m for m in sys.modules if m == "comfy" or m.startswith("comfy.")]:
+        del sys.modules[name]
+    sys.modules.update(make_comfy(with_lora_module))
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import character_creator_pro_v10
+    return character_creator_pro_v10
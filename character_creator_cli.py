@@ -0,0 +1,218 @@
+"""
+Character Creator Pro — headless prompt CLI.
+
+Turns character configs into the prompts, seed, resolution and sampler
+recommendations CharacterCreatorPro would use, without ComfyUI or torch.
+Input is streamed, records are rendered in chunks across a process
+pool, and output is written as JSONL in input order, with a bounded
+number of chunks in flight — memory stays flat for any corpus size.
+
+    python character_creator_cli.py configs.jsonl -o prompts.jsonl
+    python character_creator_cli.py configs.csv --workers 8 --model sdxl
+    cat configs.jsonl | python character_creator_cli.py - > prompts.jsonl
+
+Input records (JSONL objects or CSV rows) use the node's widget names
+(gender, age_group, art_style, outfit, camera_angle, character_name, …);
+missing keys take the node's defaults. Optional per-record keys:
+
+  preset         saved preset / Quick Preset used as the base
+  model          "sd15" or "sdxl" (default: --model)
+  base_seed      default: --base-seed
+  use_char_seed  default: on (DNA seed from name + gender + ethnicity)
+  id             copied to the output record
+
+Output records: index, id, character_name, positive, negative, seed,
+width, height, model, sampler, scheduler, steps, cfg — or index + error.
+Installed embeddings are not injected (no ComfyUI models folder).
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import character_creator_pro_v10 as ccp
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+def _defaults() -> tuple:
+    """(widget defaults, widget types / combo options) for the character widgets."""
+    specs = {**ccp._appearance_inputs(), **ccp._detail_inputs()}
+    defaults, kinds = {}, {}
+    for name, spec in specs.items():
+        kind, opts = spec[0], spec[1] if len(spec) > 1 else {}
+        defaults[name] = opts.get("default", kind[0] if isinstance(kind, list) else "")
+        kinds[name] = kind
+    return defaults, kinds
+
+
+DEFAULTS, KINDS = _defaults()
+OPTIONS = {k: frozenset(v) for k, v in KINDS.items() if isinstance(v, list)}
+
+
+def _coerce(key: str, value):
+    """CSV cells arrive as strings — convert numeric / boolean widgets."""
+    if not isinstance(value, str):
+        return value
+    kind = KINDS.get(key)
+    if kind == "FLOAT":
+        return float(value)
+    if kind == "INT" or key == "base_seed":
+        return int(value)
+    if key == "use_char_seed":
+        return value.strip().lower() in _TRUE
+    return value
+
+
+def render_record(record: dict, model: str = "sd15", base_seed: int = 42) -> dict:
+    """One output record for one input config."""
+    record = {k: _coerce(k, v) for k, v in record.items() if v not in (None, "")}
+    record_id = record.pop("id", None)
+    family    = str(record.pop("model", model)).lower()
+    seed      = int(record.pop("base_seed", base_seed))
+    use_dna   = bool(record.pop("use_char_seed", True))
+    is_sdxl   = family == "sdxl"
+
+    base = {}
+    if record.get("preset"):
+        base = ccp.resolve_character_config({"preset": record.pop("preset")})
+    for key, value in record.items():
+        if key in OPTIONS and value not in OPTIONS[key]:
+            raise ValueError(f"{key}: {value!r} is not an option")
+    cfg = {**DEFAULTS, **base, **record}
+
+    prompts = ccp.assemble_prompts(cfg, is_sdxl, embeddings=False)
+    width, height = ccp.camera_resolution(cfg["camera_angle"], is_sdxl)
+    sampler, scheduler, steps, cfg_scale = ccp.get_sampler_preset(cfg["art_style"])
+    return {
+        "id":             record_id,
+        "character_name": cfg.get("character_name", ""),
+        "positive":       prompts.positive,
+        "negative":       prompts.negative,
+        "seed":           ccp.final_character_seed(cfg, seed, use_dna),
+        "width":          width,
+        "height":         height,
+        "model":          "sdxl" if is_sdxl else "sd15",
+        "sampler":        sampler,
+        "scheduler":      scheduler,
+        "steps":          steps,
+        "cfg":            cfg_scale,
+    }
+
+
+def render_chunk(chunk: list, model: str, base_seed: int) -> tuple:
+    """(JSONL text, error count) for a chunk of (index, record) — runs in the workers."""
+    out = io.StringIO()
+    errors = 0
+    for index, record in chunk:
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict):
+                raise ValueError("not a JSON object")
+            result = {"index": index, **render_record(record, model, base_seed)}
+        except Exception as e:
+            result = {"index": index, "error": f"{type(e).__name__}: {e}"}
+            errors += 1
+        out.write(json.dumps(result, ensure_ascii=False))
+        out.write("\n")
+    return out.getvalue(), errors
+
+
+def read_records(stream, fmt: str):
+    """
+    Yield input records one at a time: CSV rows, or raw JSONL lines —
+    parsed in render_chunk(), so a malformed line becomes an error record.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def chunked(records, size: int):
+    chunk = []
+    for index, record in enumerate(records):
+        chunk.append((index, record))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(records, out, workers: int, chunk_size: int, model: str, base_seed: int) -> tuple:
+    """Stream records → out. Returns (records, errors)."""
+    total = errors = 0
+
+    def write(result):
+        nonlocal total, errors
+        text, chunk_errors = result
+        out.write(text)
+        total += text.count("\n")
+        errors += chunk_errors
+
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            write(render_chunk(chunk, model, base_seed))
+        return total, errors
+
+    # At most 2 chunks per worker in flight; results written in order,
+    # and rendered chunks are still written if reading the input fails
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+        try:
+            for chunk in chunks:
+                inflight.append(pool.submit(render_chunk, chunk, model, base_seed))
+                if len(inflight) >= workers * 2:
+                    write(inflight.popleft().result())
+        finally:
+            while inflight:
+                write(inflight.popleft().result())
+    return total, errors
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("input", help="JSONL or CSV file, or - for stdin")
+    ap.add_argument("-o", "--output", default="-", help="JSONL file (default: stdout)")
+    ap.add_argument("--format", choices=("jsonl", "csv"),
+                    help="input format (default: from the file extension, else jsonl)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="processes (1 = render in this process)")
+    ap.add_argument("--chunk-size", type=int, default=500, help="records per task")
+    ap.add_argument("--model", choices=("sd15", "sdxl"), default="sd15")
+    ap.add_argument("--base-seed", type=int, default=42)
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        total, errors = run(read_records(src, fmt), dst, args.workers,
+                            args.chunk_size, args.model, args.base_seed)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    print(f"{total} records · {errors} errors · {elapsed:.2f} s · "
+          f"{total / elapsed if elapsed else 0:,.0f} records/s · {args.workers} workers",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
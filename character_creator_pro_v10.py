@@ -6,8 +6,8 @@
 ║  ✦ Gender Lockdown — triple-layer gender enforcement                     ║
 ║  ✦ Age Lockdown — triple-layer age enforcement                           ║
 ║  ✦ Ethnicity Lockdown — conflict detection + auto softener               ║
-║  ✦ Dynamic LoRA injection (3 slots) per character                        ║
-║  ✦ Character save / load system (JSON presets)                           ║
+║  ✦ LoRA stack per character (3 slots + LORA_STACK input, merged)         ║
+║  ✦ Character save / load system (indexed SQLite preset store)            ║
 ║  ✦ Seed management with character fingerprint (DNA seed)                 ║
 ║  ✦ Advanced prompt weighting per token group                             ║
 ║  ✦ Smart camera-aware resolution (SD1.5 + SDXL)                         ║
@@ -36,18 +36,283 @@ Installation:
 """
 
 import os
+import sys
 import json
 import hashlib
-import folder_paths  # ComfyUI built-in
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+
+class _LazyModule:
+    """Module proxy that imports on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name   = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            import importlib
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+folder_paths = _LazyModule("folder_paths")  # ComfyUI built-in
 
 # ═══════════════════════════════════════════════════════════
 #  PATHS
+#  Nothing is created at import; the preset folder is made on the
+#  first save. CCP_PRESETS_DIR moves it off a read-only install.
 # ═══════════════════════════════════════════════════════════
 
-PRESETS_DIR = os.path.join(
+PRESETS_DIR = os.environ.get("CCP_PRESETS_DIR") or os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "character_presets"
 )
-os.makedirs(PRESETS_DIR, exist_ok=True)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer tuning knob from the environment (CCP_*)."""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# ═══════════════════════════════════════════════════════════
+#  IN-PROCESS CACHES
+#  Small thread-safe LRU with an entry + byte budget.
+#  Shared by the conditioning cache and later caches.
+# ═══════════════════════════════════════════════════════════
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by entry count and total bytes.
+    sizeof(value) reports the byte cost of an entry; entries larger
+    than the whole budget are never stored.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int, sizeof=None):
+        self.name        = name
+        self.max_entries = max(0, max_entries)
+        self.max_bytes   = max(0, max_bytes)
+        self._sizeof     = sizeof or (lambda value: 0)
+        self._data       = OrderedDict()   # key -> (value, nbytes)
+        self._bytes      = 0
+        self._lock       = threading.RLock()
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key, default=None):
+        """get() without touching the LRU order or the hit / miss counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        nbytes = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            if self.max_entries == 0 or nbytes > self.max_bytes:
+                return
+            self._data[key] = (value, nbytes)
+            self._bytes += nbytes
+            while (len(self._data) > self.max_entries
+                   or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> str:
+        return (f"{self.hits} hit / {self.misses} miss · "
+                f"{len(self._data)} entries · {self._bytes / 2**20:.1f} MB")
+
+
+def _tensor_nbytes(obj) -> int:
+    """Recursively sum tensor storage in nested lists / tuples / dicts."""
+    if hasattr(obj, "element_size") and hasattr(obj, "nelement"):
+        return obj.element_size() * obj.nelement()
+    if isinstance(obj, dict):
+        return sum(_tensor_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_tensor_nbytes(v) for v in obj)
+    return 0
+
+
+# ═══════════════════════════════════════════════════════════
+#  RUN PROFILING
+#  CCP_PROFILE=1 adds per-stage timings and per-run cache hit/miss
+#  counts to the debug output. CCP_RUN_LEDGER=<path> also appends one
+#  JSON record per execution to a size-rotated JSONL file
+#  (CCP_RUN_LEDGER_MB, default 16 · CCP_RUN_LEDGER_KEEP, default 3).
+# ═══════════════════════════════════════════════════════════
+
+def _cache_counters() -> dict:
+    return {
+        "cond":        (COND_CACHE.hits, COND_CACHE.misses),
+        "lora":        (LORA_CACHE.hits, LORA_CACHE.misses),
+        "lora_pairs":  (LORA_PAIR_CACHE.hits, LORA_PAIR_CACHE.misses),
+        "hints":       (HINT_CACHE.hits, HINT_CACHE.misses),
+        "budget":      (BUDGET_CACHE.hits, BUDGET_CACHE.misses),
+        "embed_scans": EMBEDDING_INVENTORY.scans,
+    }
+
+
+class RunLedger:
+    """Append-only JSONL file, rotated to <path>.1 … <path>.<keep> by size."""
+
+    def __init__(self, path: str, max_bytes: int, keep: int):
+        self.path      = path
+        self.max_bytes = max_bytes
+        self.keep      = max(0, keep)
+        self._lock     = threading.Lock()
+
+    def _rotate(self):
+        if self.keep == 0:
+            os.remove(self.path)
+            return
+        for i in range(self.keep - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                if (os.path.exists(self.path)
+                        and os.path.getsize(self.path) + len(line) > self.max_bytes):
+                    self._rotate()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"[CharacterCreator] ⚠️  Run ledger write error: {e}")
+
+
+RUN_LEDGER = (
+    RunLedger(
+        os.environ["CCP_RUN_LEDGER"],
+        _env_int("CCP_RUN_LEDGER_MB", 16) * 2**20,
+        _env_int("CCP_RUN_LEDGER_KEEP", 3),
+    )
+    if os.environ.get("CCP_RUN_LEDGER") else None
+)
+PROFILE_ENABLED = (
+    os.environ.get("CCP_PROFILE", "") not in ("", "0") or RUN_LEDGER is not None
+)
+
+
+class StageTimer:
+    """
+    Wall-clock time per numbered stage of a node execution.
+    mark(name) closes the stage that just ran; everything is a no-op
+    unless profiling is enabled.
+    """
+
+    def __init__(self, node: str, enabled: bool = None):
+        self.node    = node
+        self.enabled = PROFILE_ENABLED if enabled is None else enabled
+        self.stages  = []   # [(name, seconds)]
+        if self.enabled:
+            self._counters = _cache_counters()
+            self._start = self._last = time.perf_counter()
+
+    def mark(self, name: str):
+        if self.enabled:
+            now = time.perf_counter()
+            self.stages.append((name, now - self._last))
+            self._last = now
+
+    def total(self) -> float:
+        return self._last - self._start if self.enabled else 0.0
+
+    def cache_delta(self) -> dict:
+        """Cache hits / misses / scans during this run."""
+        now = _cache_counters()
+        delta = {}
+        for key, value in now.items():
+            before = self._counters[key]
+            if isinstance(value, tuple):
+                delta[key] = {"hits": value[0] - before[0], "misses": value[1] - before[1]}
+            else:
+                delta[key] = value - before
+        return delta
+
+    def cache_summary(self) -> str:
+        """One-line cache hits / misses during this run ("" when off)."""
+        if not self.enabled:
+            return ""
+        delta = self.cache_delta()
+        return (
+            f"cond {delta['cond']['hits']} hit / {delta['cond']['misses']} miss"
+            f" · lora {delta['lora']['hits']} hit / {delta['lora']['misses']} miss"
+            f" · pairs {delta['lora_pairs']['hits']} hit / {delta['lora_pairs']['misses']} miss"
+            f" · hints {delta['hints']['hits']} hit / {delta['hints']['misses']} miss"
+            f" · budget {delta['budget']['hits']} hit / {delta['budget']['misses']} miss"
+            f" · embed scans {delta['embed_scans']}"
+        )
+
+    def report(self) -> list:
+        """Debug lines (empty when profiling is off)."""
+        if not self.enabled:
+            return []
+        lines = [f"  Timing     : {self.total() * 1e3:.1f} ms total"]
+        lines += [f"    {name:<18}: {sec * 1e3:8.2f} ms" for name, sec in self.stages]
+        lines.append(f"  Run cache  : {self.cache_summary()}")
+        return lines
+
+    def log(self, **fields):
+        """Append this run to the JSONL ledger, if one is configured."""
+        if not self.enabled or RUN_LEDGER is None:
+            return
+        RUN_LEDGER.append({
+            "ts":       time.time(),
+            "pid":      os.getpid(),
+            "node":     self.node,
+            "total_ms": round(self.total() * 1e3, 3),
+            "stages":   {name: round(sec * 1e3, 3) for name, sec in self.stages},
+            "caches":   self.cache_delta(),
+            **fields,
+        })
+
 
 # ═══════════════════════════════════════════════════════════
 #  EMBEDDINGS AUTO-INJECTION
@@ -76,20 +341,83 @@ KNOWN_EMBEDDINGS = {
 }
 
 
+class EmbeddingInventory:
+    """
+    Which KNOWN_EMBEDDINGS are installed, per model family.
+    The embeddings folder is listed once and re-listed only when one of
+    its directories' mtime changes or refresh() is called; lookups are a
+    dict hit plus one stat() per embeddings directory.
+    NOTE: files added inside sub-folders don't touch the top-level mtime —
+          call refresh() after installing those.
+    """
+
+    def __init__(self, folder: str = "embeddings"):
+        self.folder     = folder
+        self.scans      = 0
+        self._signature = None
+        self._found     = {}   # "sd15" / "sdxl" -> (positive, negative)
+        self._version   = ""   # hash of _found, for IS_CHANGED
+        self._lock      = threading.Lock()
+
+    def _dir_signature(self) -> tuple:
+        signature = []
+        for path in folder_paths.get_folder_paths(self.folder):
+            try:
+                signature.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    def refresh(self):
+        with self._lock:
+            self._signature = None
+
+    def _rebuild(self, signature: tuple):
+        installed = {
+            os.path.splitext(f)[0].lower()
+            for f in folder_paths.get_filename_list(self.folder)
+        }
+        self._found = {
+            family: (
+                [e for e in data["positive"] if e.lower() in installed],
+                [e for e in data["negative"] if e.lower() in installed],
+            )
+            for family, data in KNOWN_EMBEDDINGS.items()
+        }
+        self._version = hashlib.sha1(
+            json.dumps(self._found, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        self._signature = signature
+        self.scans += 1
+
+    def _ensure_current(self):
+        signature = self._dir_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._rebuild(signature)
+
+    def lookup(self, is_sdxl: bool) -> tuple:
+        """(found_pos, found_neg) for the model family."""
+        self._ensure_current()
+        pos, neg = self._found.get("sdxl" if is_sdxl else "sd15", ([], []))
+        return list(pos), list(neg)
+
+    def version(self) -> str:
+        """Changes only when the set of installed known embeddings does."""
+        self._ensure_current()
+        return self._version
+
+
+EMBEDDING_INVENTORY = EmbeddingInventory()
+
+
 def get_available_embeddings(is_sdxl: bool) -> tuple:
     try:
-        installed = set(folder_paths.get_filename_list("embeddings"))
-        installed_clean = {os.path.splitext(f)[0].lower() for f in installed}
+        return EMBEDDING_INVENTORY.lookup(is_sdxl)
     except Exception:
         return [], []
 
-    key = "sdxl" if is_sdxl else "sd15"
-    data = KNOWN_EMBEDDINGS.get(key, {"negative": [], "positive": []})
-
-    found_neg = [e for e in data["negative"] if e.lower() in installed_clean]
-    found_pos = [e for e in data["positive"] if e.lower() in installed_clean]
-    return found_pos, found_neg
-
 
 def inject_embeddings(pos_text: str, neg_text: str,
                       pos_embeds: list, neg_embeds: list) -> tuple:
@@ -104,30 +432,144 @@ def inject_embeddings(pos_text: str, neg_text: str,
 #  CLIP ENCODING — SD 1.5 + SDXL unified
 # ═══════════════════════════════════════════════════════════
 
-def _detect_sdxl(clip) -> bool:
+# ── Model-family probe ────────────────────────────────────
+# Tokenizes "" once per tokenizer (shared by every clone of a CLIP, so
+# LoRA-patched copies hit the same entry) and remembers what it found.
+# Weak keys: the cache never keeps a model alive.
+
+ClipFamily = namedtuple("ClipFamily", [
+    "family",        # "sd15" / "sdxl"
+    "is_sdxl",
+    "encoders",      # tokenizer keys, e.g. ("l",) or ("g", "l")
+    "chunk_length",  # tokens per chunk incl. start/end (77)
+    "start_token",
+    "end_token",
+    "empty_tokens",  # tokenize("") — one empty chunk per encoder
+])
+
+_FAMILY_CACHE = weakref.WeakKeyDictionary()
+
+
+def _probe_clip_family(clip) -> ClipFamily:
+    tokens = clip.tokenize("")
+    if not isinstance(tokens, dict) or not tokens:
+        return ClipFamily("sd15", False, (), 77, None, None, tokens)
+    encoders = tuple(tokens.keys())
+    # SDXL tokenizer returns a dict with keys 'l' and 'g'
+    is_sdxl = len(encoders) > 1
+    chunk = tokens[encoders[0]][0]
+    start_token = chunk[0][0] if len(chunk) > 0 else None
+    end_token   = chunk[1][0] if len(chunk) > 1 else None
+    return ClipFamily(
+        "sdxl" if is_sdxl else "sd15", is_sdxl, encoders,
+        len(chunk) or 77, start_token, end_token, tokens,
+    )
+
+
+def clip_family(clip) -> ClipFamily:
     """
-    Reliably detect SDXL by checking for dual tokenizer keys.
-    Falls back safely if tokenizer raises.
+    Cached model-family probe for a CLIP (SD 1.5 vs SDXL + tokenizer
+    properties). Falls back to SD 1.5 if the tokenizer raises.
     """
+    owner = getattr(clip, "tokenizer", None) or clip
     try:
-        tokens = clip.tokenize("test")
-        # SDXL tokenizer returns a dict with keys 'l' and 'g'
-        return isinstance(tokens, dict) and len(tokens) > 1
+        family = _FAMILY_CACHE.get(owner)
+    except TypeError:   # not weak-referenceable
+        family = None
+    if family is not None:
+        return family
+    try:
+        family = _probe_clip_family(clip)
     except Exception:
-        return False
+        return ClipFamily("sd15", False, (), 77, None, None, None)
+    try:
+        _FAMILY_CACHE[owner] = family
+    except TypeError:
+        pass
+    return family
+
+
+# ── Conditioning cache ────────────────────────────────────
+# Most queue runs re-encode the exact same positive / negative text
+# with only the seed changed. Cache the CONDITIONING keyed by
+# (CLIP identity incl. LoRA stack, final prompt text).
+# Tune with CCP_COND_CACHE_ENTRIES / CCP_COND_CACHE_MB.
+
+COND_CACHE = LRUCache(
+    "conditioning",
+    max_entries=_env_int("CCP_COND_CACHE_ENTRIES", 64),
+    max_bytes=_env_int("CCP_COND_CACHE_MB", 256) * 2**20,
+    sizeof=lambda entry: _tensor_nbytes(entry[1]),
+)
+
+
+def clip_identity(clip) -> tuple:
+    """
+    Stable cache identity for a CLIP object.
+    Clones sharing the same text encoder, patch set and clip-skip layer
+    map to the same identity; LoRAs applied by this node are tracked
+    explicitly as an ordered ((name, size, mtime), strength) stack, so a
+    LoRA file replaced under the same name misses.
+    """
+    stack = getattr(clip, "_ccp_lora_stack", None)
+    if stack is not None:
+        return (clip._ccp_base_identity, stack)
+    encoder = getattr(clip, "cond_stage_model", clip)
+    patcher = getattr(clip, "patcher", None)
+    patches = getattr(patcher, "patches_uuid", None)
+    if patches is None:
+        patches = id(patcher) if patcher is not None else id(clip)
+    return (id(encoder), patches, getattr(clip, "layer_idx", None))
+
+
+def _copy_conditioning(cond: list) -> list:
+    """Fresh outer lists / dicts so downstream nodes can't mutate the cache."""
+    return [[c[0], dict(c[1])] for c in cond]
+
+
+def encode_prompt(clip, text: str, use_cache: bool = True,
+                  pad_to_chunks: int = 0) -> list:
+    """
+    Cached front-end for _encode_prompt_uncached().
+    Returns standard ComfyUI CONDITIONING format.
+    """
+    if not use_cache:
+        return _encode_prompt_uncached(clip, text, pad_to_chunks)
+
+    encoder = getattr(clip, "cond_stage_model", clip)
+    key = (clip_identity(clip), text, pad_to_chunks)
+    entry = COND_CACHE.get(key)
+    # id() can be recycled once a model is freed — verify the encoder
+    if entry is not None and entry[0]() is encoder:
+        return _copy_conditioning(entry[1])
+
+    cond = _encode_prompt_uncached(clip, text, pad_to_chunks)
+    try:
+        COND_CACHE.put(key, (weakref.ref(encoder), cond))
+    except TypeError:
+        pass  # encoder not weak-referenceable → don't cache
+    return _copy_conditioning(cond)
 
 
-def encode_prompt(clip, text: str) -> list:
+def _encode_prompt_uncached(clip, text: str, pad_to_chunks: int = 0) -> list:
     """
     Unified CLIP encoding for SD 1.5 and SDXL.
+    pad_to_chunks appends empty-prompt chunks up to that many 77-token
+    chunks (used to give positive and negative the same length).
     Returns standard ComfyUI CONDITIONING format.
     """
     tokens = clip.tokenize(text)
-    is_sdxl = isinstance(tokens, dict) and len(tokens) > 1
+    if pad_to_chunks and isinstance(tokens, dict):
+        empty = clip_family(clip).empty_tokens or {}
+        for key, chunks in tokens.items():
+            if key in empty and len(chunks) < pad_to_chunks:
+                tokens[key] = chunks + [list(empty[key][0])
+                                        for _ in range(pad_to_chunks - len(chunks))]
 
     try:
+        # pooled_output is kept for SD 1.5 too (harmless, some nodes read it)
         cond, pooled = clip.encode_from_tokens(tokens, return_pooled=True)
-        return [[cond, {"pooled_output": pooled}]] if is_sdxl else [[cond, {"pooled_output": pooled}]]
+        return [[cond, {"pooled_output": pooled}]]
     except TypeError:
         # Older ComfyUI builds that don't support return_pooled
         cond = clip.encode_from_tokens(tokens)
@@ -138,6 +580,82 @@ def encode_prompt(clip, text: str) -> list:
         return [[cond, {}]]
 
 
+def _common_length_conds(clip, parts: list) -> list:
+    """
+    Bring [1, tokens, dim] conds to one token length.
+    Repeating a cond to the LCM length is exact for cross-attention and is
+    what ComfyUI's sampler does itself; like ComfyUI, give up on that past
+    4x the longest cond and pad with empty-prompt chunks instead.
+    """
+    import math
+    import torch
+    lengths = [p.shape[1] for p in parts]
+    longest = max(lengths)
+    target  = math.lcm(*lengths)
+    if target <= longest * 4:
+        return [p.repeat(1, target // p.shape[1], 1) for p in parts]
+
+    empty = encode_prompt(clip, "")[0][0]
+    chunk = empty.shape[1]
+    padded = []
+    for p in parts:
+        missing = (longest - p.shape[1]) // chunk
+        if missing:
+            filler = empty.to(p.device, p.dtype).repeat(1, missing, 1)
+            p = torch.cat([p, filler], dim=1)
+        padded.append(p)
+    return padded
+
+
+def encode_prompt_batch(clip, texts: list) -> list:
+    """
+    Encode N prompts into one batched CONDITIONING ([N, tokens, dim]).
+
+    SD 1.5: the 77-token chunks of every prompt are concatenated into a
+    single token list and encoded in ONE encode_from_tokens call, then
+    split back per prompt. ComfyUI weights each chunk independently, so
+    the result matches per-prompt encoding.
+    SDXL: pooled_output comes from each prompt's first chunk and
+    encode_from_tokens only returns the first one, so prompts are encoded
+    individually (through the conditioning cache) and stacked.
+
+    Prompts with different chunk counts are brought to a common length by
+    _common_length_conds().
+    """
+    import torch
+
+    if not texts:
+        raise ValueError("encode_prompt_batch: no prompts given")
+
+    family = clip_family(clip)
+    if family.is_sdxl or not family.encoders:
+        conds  = [encode_prompt(clip, t) for t in texts]
+        parts  = [c[0][0] for c in conds]
+        pooled = [c[0][1].get("pooled_output") for c in conds]
+    else:
+        key    = family.encoders[0]
+        tokens = [clip.tokenize(t) for t in texts]
+        counts = [len(t[key]) for t in tokens]
+        merged = {key: [chunk for t in tokens for chunk in t[key]]}
+        try:
+            cond, first_pooled = clip.encode_from_tokens(merged, return_pooled=True)
+        except TypeError:
+            cond, first_pooled = clip.encode_from_tokens(merged), None
+        width = cond.shape[-2] // sum(counts)
+        parts, start = [], 0
+        for n in counts:
+            parts.append(cond[:, start * width:(start + n) * width])
+            start += n
+        # SD 1.5 UNets ignore pooled_output — keep the key for compatibility
+        pooled = [first_pooled] * len(texts)
+
+    batch = torch.cat(_common_length_conds(clip, parts), dim=0)
+    extra = {}
+    if all(p is not None for p in pooled):
+        extra["pooled_output"] = torch.cat(pooled, dim=0)
+    return [[batch, extra]]
+
+
 # ═══════════════════════════════════════════════════════════
 #  DYNAMIC CFG + SAMPLER RECOMMENDATIONS
 # ═══════════════════════════════════════════════════════════
@@ -169,6 +687,42 @@ def get_sampler_preset(art_style: str) -> tuple:
 #  LORA HELPER — FIX: correct comfy.sd API usage
 # ═══════════════════════════════════════════════════════════
 
+# ── LoRA weight cache ─────────────────────────────────────
+# Keeps parsed LoRA state dicts in RAM so alternating characters doesn't
+# re-read 200–800 MB files from disk. Keyed by (path, size, mtime) so an
+# overwritten file is picked up. Tune with CCP_LORA_CACHE_ENTRIES /
+# CCP_LORA_CACHE_MB.
+
+LORA_CACHE = LRUCache(
+    "lora",
+    max_entries=_env_int("CCP_LORA_CACHE_ENTRIES", 16),
+    max_bytes=_env_int("CCP_LORA_CACHE_MB", 2048) * 2**20,
+    sizeof=_tensor_nbytes,
+)
+
+
+def _read_lora_file(lora_path: str) -> dict:
+    import comfy.utils
+    return comfy.utils.load_torch_file(lora_path, safe_load=True)
+
+
+def load_lora_weights(lora_path: str) -> dict:
+    """
+    Return the LoRA state dict for lora_path, from LORA_CACHE when the
+    file's size and mtime are unchanged since it was last read.
+    """
+    st  = os.stat(lora_path)
+    key = (lora_path, st.st_size, st.st_mtime_ns)
+    lora_data = LORA_CACHE.get(key)
+    if lora_data is None:
+        lora_data = _read_lora_file(lora_path)
+        # Drop stale versions of the same file before caching the new one
+        for stale in [k for k in LORA_CACHE.keys() if k[0] == lora_path]:
+            LORA_CACHE.pop(stale)
+        LORA_CACHE.put(key, lora_data)
+    return lora_data
+
+
 def apply_lora(model, clip, lora_name: str,
                strength_model: float, strength_clip: float):
     """
@@ -176,42 +730,576 @@ def apply_lora(model, clip, lora_name: str,
     FIX: comfy.sd.load_lora_for_models returns (model, clip) tuple,
          not a dict — previous code would crash on dict unpack.
     """
-    if not lora_name or lora_name == "None":
+    return apply_lora_stack(model, clip, [(lora_name, strength_model, strength_clip)])
+
+
+def merge_lora_stack(stack: list) -> list:
+    """
+    [(name, model_str, clip_str)] with empty / "None" slots dropped and
+    repeated LoRAs merged into one entry by summing strengths
+    (first-seen order kept).
+    """
+    merged = OrderedDict()
+    for name, strength_model, strength_clip in stack:
+        if not name or name == "None":
+            continue
+        ms, cs = merged.get(name, (0.0, 0.0))
+        merged[name] = (ms + float(strength_model), cs + float(strength_clip))
+    return [(name, ms, cs) for name, (ms, cs) in merged.items()]
+
+
+def _tag_lora_clip(new_clip, clip, applied: tuple):
+    """Record the applied LoRA stack on new_clip for the conditioning cache key."""
+    new_clip._ccp_base_identity = (
+        clip._ccp_base_identity
+        if getattr(clip, "_ccp_lora_stack", None) is not None
+        else clip_identity(clip)
+    )
+    new_clip._ccp_lora_stack = getattr(clip, "_ccp_lora_stack", ()) + applied
+
+
+def _lora_for_models(model, clip, lora_data, strength_model, strength_clip):
+    """comfy.sd.load_lora_for_models — tuple or dict return (version differences)."""
+    import comfy.sd as comfy_sd
+    # Returns (model_patched, clip_patched) — a tuple, not a dict
+    result = comfy_sd.load_lora_for_models(
+        model, clip, lora_data, strength_model, strength_clip
+    )
+    if isinstance(result, dict):
+        return result["model"], result["clip"]
+    return result[0], result[1]
+
+
+# ── Patched MODEL / CLIP cache ────────────────────────────
+# Switching between a handful of characters re-applies the same LoRA
+# stacks to the same checkpoint. Keep each patched (MODEL, CLIP) pair,
+# keyed by the base MODEL / CLIP identity and the merged stack with its
+# file versions. Patched copies share the base weights, so the cache is
+# bounded by count only (CCP_LORA_PAIR_CACHE_ENTRIES). Cached pairs are
+# dropped whenever comfy.model_management has to unload models, so they
+# never hold on to memory sampling needs.
+
+LORA_PAIR_CACHE = LRUCache(
+    "lora pairs",
+    max_entries=_env_int("CCP_LORA_PAIR_CACHE_ENTRIES", 4),
+    max_bytes=1 << 62,
+)
+
+
+def model_identity(model) -> tuple:
+    """Base weights + patch set of a MODEL (ModelPatcher)."""
+    inner = getattr(model, "model", model)
+    return (id(inner), getattr(model, "patches_uuid", id(model)))
+
+
+def _weak(obj):
+    return weakref.ref(obj) if obj is not None else (lambda: None)
+
+
+def evict_lora_pairs(keep_loaded=()) -> int:
+    """
+    Drop cached patched pairs, except those whose MODEL is in keep_loaded
+    (ComfyUI LoadedModel entries about to be used). Returns the count.
+    """
+    keep = {id(getattr(loaded, "model", loaded)) for loaded in keep_loaded or ()}
+    dropped = 0
+    for key in LORA_PAIR_CACHE.keys():
+        entry = LORA_PAIR_CACHE.peek(key)
+        if entry is not None and id(entry[2]) not in keep:
+            LORA_PAIR_CACHE.pop(key)
+            dropped += 1
+    LORA_PAIR_CACHE.evictions += dropped
+    return dropped
+
+
+def _hook_model_management():
+    """
+    Wrap comfy.model_management.free_memory / unload_all_models (once per
+    module object) so cached pairs are released under memory pressure.
+    """
+    try:
+        import comfy.model_management as mm
+    except ImportError:
+        return
+
+    free_memory = getattr(mm, "free_memory", None)
+    if free_memory is not None and not getattr(free_memory, "_ccp_hooked", False):
+        def hooked_free_memory(*args, **kwargs):
+            before = len(getattr(mm, "current_loaded_models", ()))
+            unloaded = free_memory(*args, **kwargs)
+            # Newer ComfyUI returns the unloaded models; older returns None
+            if unloaded or len(getattr(mm, "current_loaded_models", ())) < before:
+                evict_lora_pairs(kwargs.get("keep_loaded", args[2] if len(args) > 2 else ()))
+            return unloaded
+        hooked_free_memory._ccp_hooked = True
+        mm.free_memory = hooked_free_memory
+
+    unload_all_models = getattr(mm, "unload_all_models", None)
+    if unload_all_models is not None and not getattr(unload_all_models, "_ccp_hooked", False):
+        def hooked_unload_all_models(*args, **kwargs):
+            evict_lora_pairs()
+            return unload_all_models(*args, **kwargs)
+        hooked_unload_all_models._ccp_hooked = True
+        mm.unload_all_models = hooked_unload_all_models
+
+
+def apply_lora_stack(model, clip, stack: list, use_cache: bool = True):
+    """
+    Apply several LoRAs at once: duplicates merged (merge_lora_stack),
+    each file loaded once, the model / CLIP side skipped when its
+    strength is 0, and all patches added to a single clone per side.
+    Falls back to one load_lora_for_models() call per LoRA when
+    comfy.lora isn't available. The patched pair is reused from
+    LORA_PAIR_CACHE for the same base MODEL / CLIP and stack.
+    """
+    merged = merge_lora_stack(stack)
+    if not merged:
         return model, clip
+    if not use_cache:
+        return _apply_lora_stack_uncached(model, clip, merged)
+
+    key = (
+        model_identity(model) if model is not None else None,
+        clip_identity(clip) if clip is not None else None,
+        tuple(_file_version("loras", name) + (ms, cs) for name, ms, cs in merged),
+    )
+    entry = LORA_PAIR_CACHE.get(key)
+    # id() can be recycled once a model is freed — verify the base objects
+    if entry is not None and entry[0]() is model and entry[1]() is clip:
+        return entry[2], entry[3]
+
+    new_model, new_clip = _apply_lora_stack_uncached(model, clip, merged)
     try:
-        import comfy.sd as comfy_sd
-        lora_path = folder_paths.get_full_path("loras", lora_name)
-        if lora_path is None:
-            print(f"[CharacterCreator] ⚠️  LoRA not found: {lora_name}")
-            return model, clip
-
-        lora_data = comfy_sd.load_lora(lora_path)
-        # Returns (model_patched, clip_patched) — a tuple, not a dict
-        result = comfy_sd.load_lora_for_models(
-            model, clip, lora_data, strength_model, strength_clip
-        )
-        # Handle both tuple and dict return (ComfyUI version differences)
-        if isinstance(result, dict):
-            return result["model"], result["clip"]
-        return result[0], result[1]
+        LORA_PAIR_CACHE.put(key, (_weak(model), _weak(clip), new_model, new_clip))
+        _hook_model_management()
+    except TypeError:
+        pass  # not weak-referenceable → don't cache
+    return new_model, new_clip
 
-    except Exception as e:
-        print(f"[CharacterCreator] ⚠️  LoRA load error ({lora_name}): {e}")
+
+def _apply_lora_stack_uncached(model, clip, merged: list):
+    loaded = []
+    for name, strength_model, strength_clip in merged:
+        if strength_model == 0 and strength_clip == 0:
+            continue
+        try:
+            lora_path = folder_paths.get_full_path("loras", name)
+            if lora_path is None:
+                print(f"[CharacterCreator] ⚠️  LoRA not found: {name}")
+                continue
+            loaded.append((name, strength_model, strength_clip, load_lora_weights(lora_path)))
+        except Exception as e:
+            print(f"[CharacterCreator] ⚠️  LoRA load error ({name}): {e}")
+    if not loaded:
         return model, clip
 
+    try:
+        import comfy.lora as comfy_lora
+        patch_model = model is not None and any(ms != 0 for _, ms, _, _ in loaded)
+        patch_clip  = clip  is not None and any(cs != 0 for _, _, cs, _ in loaded)
+        key_map = {}
+        if patch_model:
+            key_map = comfy_lora.model_lora_keys_unet(model.model, key_map)
+        if patch_clip:
+            key_map = comfy_lora.model_lora_keys_clip(clip.cond_stage_model, key_map)
+    except Exception:
+        comfy_lora = None
+    try:
+        from comfy.lora_convert import convert_lora
+    except ImportError:
+        convert_lora = None
+
+    new_model, new_clip = model, clip
+    applied_clip = ()
+    if comfy_lora is not None:
+        new_model = model.clone() if patch_model else model
+        new_clip  = clip.clone()  if patch_clip  else clip
+        for name, ms, cs, lora_data in loaded:
+            try:
+                patches = comfy_lora.load_lora(
+                    convert_lora(lora_data) if convert_lora else lora_data, key_map
+                )
+                if patch_model and ms != 0:
+                    new_model.add_patches(patches, ms)
+                if patch_clip and cs != 0:
+                    new_clip.add_patches(patches, cs)
+                    applied_clip += (_file_version("loras", name) + (cs,),)
+            except Exception as e:
+                print(f"[CharacterCreator] ⚠️  LoRA apply error ({name}): {e}")
+    else:
+        for name, ms, cs, lora_data in loaded:
+            try:
+                m, c = _lora_for_models(
+                    new_model if ms != 0 else None, new_clip if cs != 0 else None,
+                    lora_data, ms, cs,
+                )
+                if ms != 0 and m is not None:
+                    new_model = m
+                if cs != 0 and c is not None:
+                    new_clip = c
+                    applied_clip += (_file_version("loras", name) + (cs,),)
+            except Exception as e:
+                print(f"[CharacterCreator] ⚠️  LoRA load error ({name}): {e}")
+
+    if new_clip is not None and new_clip is not clip:
+        _tag_lora_clip(new_clip, clip, applied_clip)
+    return new_model, new_clip
+
 
 # ═══════════════════════════════════════════════════════════
 #  CHARACTER PRESET SYSTEM
 # ═══════════════════════════════════════════════════════════
 
+def safe_filename(name: str) -> str:
+    """Keep letters, digits, space, '_' and '-' (drops emoji and path chars)."""
+    return "".join(c for c in name if c.isalnum() or c in " _-").strip()
+
+
+class PresetStore:
+    """
+    Character presets in a single SQLite database (WAL mode) with indexed
+    name / gender / age_group / art_style columns and an in-memory read
+    cache. Other processes' commits are noticed via PRAGMA data_version.
+
+    Legacy one-JSON-file-per-preset folders are imported on first open;
+    writing JSON copies next to the database is optional
+    (CCP_PRESET_JSON_EXPORT=1, or export_json()).
+
+    Reads never create files: without a database the JSON presets are
+    served from an in-memory copy, and a database in a read-only folder
+    is opened immutable. The first write creates the folder and file.
+    """
+
+    DB_NAME = "presets.sqlite3"
+    INDEXED = ("gender", "age_group", "art_style")
+
+    def __init__(self, directory: str, json_export: bool = False):
+        self.directory   = directory
+        self.json_export = json_export
+        self.generation  = 0        # bumped on every change seen
+        self._conn       = None
+        self._writable   = False    # _conn is the on-disk database, read-write
+        self._lock       = threading.RLock()
+        self._names      = None     # cached sorted name list
+        self._cache      = {}       # name -> preset dict
+        self._versions   = {}       # name -> content hash
+        self._data_version = None
+
+    # ── connection ───────────────────────────────────────
+    def _db(self, write: bool = False):
+        if self._conn is not None and (self._writable or not write):
+            return self._conn
+        import sqlite3
+        path = os.path.join(self.directory, self.DB_NAME)
+        if write or (os.path.exists(path) and os.access(self.directory, os.W_OK)):
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            writable = True
+        elif os.path.exists(path):
+            # Read-only folder: nothing to create or import. mode=ro still
+            # sees WAL content; immutable is the fallback when the -shm
+            # file can't be created.
+            writable = None
+            try:
+                conn = sqlite3.connect(
+                    f"file:{path}?mode=ro", uri=True, check_same_thread=False
+                )
+                conn.execute("SELECT 1 FROM presets LIMIT 1")
+            except sqlite3.Error:
+                conn = sqlite3.connect(
+                    f"file:{path}?immutable=1", uri=True, check_same_thread=False
+                )
+        else:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            writable = False
+        if writable is not None:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS presets ("
+                " name TEXT PRIMARY KEY,"
+                " gender TEXT, age_group TEXT, art_style TEXT,"
+                " data TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            for col in self.INDEXED:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_presets_{col} ON presets({col})"
+                )
+            conn.commit()
+            self._import_json(conn, self.directory)
+        if self._conn is not None:
+            self._conn.close()
+        self._conn, self._writable = conn, bool(writable)
+        self._data_version = None
+        self._invalidate()
+        return conn
+
+    def _check_external_changes(self, conn):
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._invalidate()
+
+    def _invalidate(self):
+        self._names = None
+        self._cache.clear()
+        self._versions.clear()
+        self.generation += 1
+
+    # ── reads ────────────────────────────────────────────
+    def current_generation(self) -> int:
+        """generation after picking up other processes' commits."""
+        with self._lock:
+            self._check_external_changes(self._db())
+            return self.generation
+
+    def names(self) -> list:
+        with self._lock:
+            conn = self._db()
+            self._check_external_changes(conn)
+            if self._names is None:
+                self._names = [
+                    row[0] for row in
+                    conn.execute("SELECT name FROM presets ORDER BY name")
+                ]
+            return list(self._names)
+
+    def load(self, name: str) -> dict:
+        with self._lock:
+            conn = self._db()
+            self._check_external_changes(conn)
+            data = self._cache.get(name)
+            if data is None:
+                row = conn.execute(
+                    "SELECT data FROM presets WHERE name = ?", (name,)
+                ).fetchone()
+                if row is None:
+                    return {}
+                data = self._cache[name] = json.loads(row[0])
+            return dict(data)
+
+    def version(self, name: str) -> str:
+        """Content hash of a stored preset ("" if it doesn't exist)."""
+        with self._lock:
+            conn = self._db()
+            self._check_external_changes(conn)
+            version = self._versions.get(name)
+            if version is None:
+                row = conn.execute(
+                    "SELECT data FROM presets WHERE name = ?", (name,)
+                ).fetchone()
+                version = hashlib.sha1(row[0].encode()).hexdigest()[:16] if row else ""
+                self._versions[name] = version
+            return version
+
+    def query(self, **filters) -> list:
+        """Preset names matching exact values of the indexed columns."""
+        unknown = set(filters) - set(self.INDEXED)
+        if unknown:
+            raise ValueError(f"not an indexed preset column: {sorted(unknown)}")
+        where = " AND ".join(f"{col} = ?" for col in filters) or "1"
+        with self._lock:
+            return [
+                row[0] for row in self._db().execute(
+                    f"SELECT name FROM presets WHERE {where} ORDER BY name",
+                    tuple(filters.values()),
+                )
+            ]
+
+    # ── writes ───────────────────────────────────────────
+    def _upsert(self, conn, name: str, data: dict, updated: float):
+        conn.execute(
+            "INSERT INTO presets (name, gender, age_group, art_style, data, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET gender = excluded.gender,"
+            " age_group = excluded.age_group, art_style = excluded.art_style,"
+            " data = excluded.data, updated = excluded.updated",
+            (name, data.get("gender"), data.get("age_group"), data.get("art_style"),
+             self.serialize(data), updated),
+        )
+
+    @staticmethod
+    def serialize(data: dict) -> str:
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def content_hash(cls, data: dict) -> str:
+        """Same value version() reports once data is stored."""
+        return hashlib.sha1(cls.serialize(data).encode()).hexdigest()[:16]
+
+    def save(self, name: str, data: dict):
+        with self._lock:
+            conn = self._db(write=True)
+            with conn:
+                self._upsert(conn, name, data, time.time())
+            self._invalidate()
+        if self.json_export:
+            self.export_json(name, data)
+
+    def delete(self, name: str):
+        with self._lock:
+            conn = self._db(write=True)
+            with conn:
+                conn.execute("DELETE FROM presets WHERE name = ?", (name,))
+            self._invalidate()
+
+    # ── JSON import / export ─────────────────────────────
+    def import_json_dir(self, directory: str) -> int:
+        """Import *.json presets whose name isn't in the database yet."""
+        with self._lock:
+            imported = self._import_json(self._db(write=True), directory)
+            if imported:
+                self._invalidate()
+            return imported
+
+    def _import_json(self, conn, directory: str) -> int:
+        if not os.path.isdir(directory):
+            return 0
+        with self._lock:
+            known = {row[0] for row in conn.execute("SELECT name FROM presets")}
+            imported = 0
+            with conn:
+                for f in sorted(os.listdir(directory)):
+                    if not f.endswith(".json") or f[:-5] in known:
+                        continue
+                    path = os.path.join(directory, f)
+                    try:
+                        with open(path, "r", encoding="utf-8") as fh:
+                            data = json.load(fh)
+                    except Exception as e:
+                        print(f"[CharacterCreator] ⚠️  Preset import error ({f}): {e}")
+                        continue
+                    self._upsert(conn, f[:-5], data, os.path.getmtime(path))
+                    imported += 1
+            return imported
+
+    def export_json(self, name: str, data: dict = None, directory: str = None):
+        data = self.load(name) if data is None else data
+        directory = directory or self.directory
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.json")
+        # temp file + rename: readers never see a half-written preset
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def export_all(self, directory: str = None) -> int:
+        names = self.names()
+        for name in names:
+            self.export_json(name, directory=directory)
+        return len(names)
+
+
+PRESET_STORE = PresetStore(
+    PRESETS_DIR,
+    json_export=os.environ.get("CCP_PRESET_JSON_EXPORT", "") not in ("", "0"),
+)
+
+
+class PresetWriter:
+    """
+    Write-behind preset saves. submit() returns immediately:
+      • data identical to what's stored (content hash) → skipped,
+      • repeated saves of a name still queued → coalesced, last one wins,
+      • everything else is written by one background thread.
+    Pending saves are visible to load_character_preset() right away and
+    flushed at interpreter exit. CCP_PRESET_WRITE_BEHIND=0 writes inline.
+    """
+
+    def __init__(self, store: PresetStore, background: bool = True):
+        self.store      = store
+        self.background = background
+        self.written    = 0
+        self.skipped    = 0
+        self.coalesced  = 0
+        self._pending   = OrderedDict()   # name -> data, oldest first
+        self._inflight  = {}              # name -> data being written
+        self._cond      = threading.Condition()
+        self._thread    = None
+
+    def submit(self, name: str, data: dict) -> bool:
+        """Queue a save; False if the stored preset already has this content."""
+        data = dict(data)
+        digest = self.store.content_hash(data)
+        # One acquisition: the writer thread can't move this name between
+        # _pending / _inflight / the store while we decide
+        with self._cond:
+            if name in self._pending:
+                self._pending[name] = data
+                self.coalesced += 1
+                return True
+            if name not in self._inflight and digest == self.store.version(name):
+                self.skipped += 1
+                return False
+            if self.background:
+                self._pending[name] = data
+                self._start()
+                self._cond.notify_all()
+                return True
+        self._write(name, data)
+        return True
+
+    def pending(self, name: str):
+        """Queued / in-flight data for name, or None."""
+        with self._cond:
+            data = self._pending.get(name) or self._inflight.get(name)
+            return dict(data) if data is not None else None
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued save is written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._inflight, timeout
+            )
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            if self._thread is None:
+                import atexit
+                atexit.register(self.flush)
+            self._thread = threading.Thread(
+                target=self._run, name="ccp-preset-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _write(self, name: str, data: dict):
+        try:
+            self.store.save(name, data)
+            self.written += 1
+        except Exception as e:
+            print(f"[CharacterCreator] ⚠️  Preset save error ({name}): {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                name, data = self._pending.popitem(last=False)
+                self._inflight[name] = data
+            try:
+                self._write(name, data)
+            finally:
+                with self._cond:
+                    self._inflight.pop(name, None)
+                    self._cond.notify_all()
+
+
+PRESET_WRITER = PresetWriter(
+    PRESET_STORE,
+    background=os.environ.get("CCP_PRESET_WRITE_BEHIND", "1") not in ("", "0"),
+)
+
+
 def save_character_preset(name: str, data: dict) -> bool:
-    safe_name = "".join(c for c in name if c.isalnum() or c in " _-").strip()
+    safe_name = safe_filename(name)
     if not safe_name:
         return False
-    path = os.path.join(PRESETS_DIR, f"{safe_name}.json")
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        PRESET_WRITER.submit(safe_name, data)
         return True
     except Exception as e:
         print(f"[CharacterCreator] ⚠️  Preset save error: {e}")
@@ -221,24 +1309,118 @@ def save_character_preset(name: str, data: dict) -> bool:
 def load_character_preset(name: str) -> dict:
     if not name or name == "None":
         return {}
-    path = os.path.join(PRESETS_DIR, f"{name}.json")
-    if not os.path.exists(path):
-        return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        pending = PRESET_WRITER.pending(name)
+        if pending is not None:
+            return pending
+        return PRESET_STORE.load(name)
     except Exception as e:
         print(f"[CharacterCreator] ⚠️  Preset load error: {e}")
         return {}
 
 
 def list_character_presets() -> list:
-    presets = ["None"]
-    if os.path.exists(PRESETS_DIR):
-        for f in sorted(os.listdir(PRESETS_DIR)):
-            if f.endswith(".json"):
-                presets.append(f[:-5])
-    return presets
+    try:
+        return ["None"] + PRESET_STORE.names()
+    except Exception as e:
+        print(f"[CharacterCreator] ⚠️  Preset list error: {e}")
+        return ["None"]
+
+
+# ═══════════════════════════════════════════════════════════
+#  INPUT SPEC CACHE
+#  ComfyUI calls INPUT_TYPES on every /object_info request. The LoRA
+#  list and the built specs are kept until a loras folder's mtime or
+#  the preset store's generation changes; refresh_input_types() (or
+#  POST /character_creator/refresh) forces a rebuild, e.g. after adding
+#  LoRAs inside sub-folders.
+# ═══════════════════════════════════════════════════════════
+
+class InputSpecCache:
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self._loras     = None   # (loras signature, ["None", ...])
+        self._specs     = {}     # node key -> (signature, spec)
+        self._forced    = 0      # bumped by refresh()
+        self.builds     = 0
+
+    def _loras_signature(self) -> tuple:
+        signature = [self._forced]
+        for path in folder_paths.get_folder_paths("loras"):
+            try:
+                signature.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    def _presets_signature(self) -> int:
+        try:
+            return PRESET_STORE.current_generation()
+        except Exception:
+            return -1
+
+    def lora_list(self) -> list:
+        """["None"] + installed LoRA filenames."""
+        signature = self._loras_signature()
+        cached = self._loras
+        if cached is None or cached[0] != signature:
+            cached = self._loras = (
+                signature, ["None"] + folder_paths.get_filename_list("loras")
+            )
+        return cached[1]
+
+    def get(self, key: str, build):
+        """
+        build() for key, reused while LoRAs and presets are unchanged.
+        The returned spec is shared — callers must not mutate it.
+        """
+        signature = (self._loras_signature(), self._presets_signature())
+        entry = self._specs.get(key)
+        if entry is None or entry[0] != signature:
+            with self._lock:
+                entry = self._specs.get(key)
+                if entry is None or entry[0] != signature:
+                    entry = self._specs[key] = (signature, build())
+                    self.builds += 1
+        return entry[1]
+
+    def refresh(self):
+        with self._lock:
+            self._forced += 1
+            self._loras = None
+            self._specs.clear()
+
+
+INPUT_SPEC_CACHE = InputSpecCache()
+
+
+def cached_input_types(fn):
+    """Wrap an INPUT_TYPES that lists LoRAs or presets (below @classmethod)."""
+    def INPUT_TYPES(cls):
+        return INPUT_SPEC_CACHE.get(cls.__name__, lambda: fn(cls))
+    INPUT_TYPES.__doc__ = fn.__doc__
+    return INPUT_TYPES
+
+
+def refresh_input_types():
+    """Drop cached LoRA lists / specs and re-check embeddings + presets."""
+    INPUT_SPEC_CACHE.refresh()
+    EMBEDDING_INVENTORY.refresh()
+    PRESET_STORE.current_generation()
+
+
+def _register_routes():
+    """POST /character_creator/refresh — only when ComfyUI's server is loaded."""
+    server = sys.modules.get("server")
+    prompt_server = getattr(getattr(server, "PromptServer", None), "instance", None)
+    if prompt_server is None:
+        return
+    from aiohttp import web
+
+    @prompt_server.routes.post("/character_creator/refresh")
+    async def _refresh(request):
+        refresh_input_types()
+        return web.json_response({"ok": True})
 
 
 # ═══════════════════════════════════════════════════════════
@@ -257,6 +1439,18 @@ def character_seed(name: str, gender: str, ethnicity: str, base_seed: int) -> in
     return (base_seed + h) % (2 ** 32)
 
 
+def series_seeds(seed: int, count: int) -> list:
+    """
+    Seeds for a series of count images of one character: the DNA seed
+    first, then sha256-derived ones. Same seed + index = same seed.
+    """
+    seeds = [seed]
+    for index in range(1, count):
+        h = int(hashlib.sha256(f"{seed}|series|{index}".encode()).hexdigest(), 16)
+        seeds.append(h % (2 ** 32))
+    return seeds
+
+
 # ═══════════════════════════════════════════════════════════
 #  PROMPT BUILDER — Advanced Weighted Token System
 # ═══════════════════════════════════════════════════════════
@@ -272,6 +1466,22 @@ def build_positive_prompt(cfg: dict) -> str:
     """
     Construct a weighted, ordered positive prompt.
     Token order = attention priority in SD/SDXL.
+    """
+    return join_prompt_blocks(build_positive_blocks(cfg))
+
+
+def join_prompt_blocks(blocks: list) -> str:
+    return ", ".join(text for _, text in blocks if text)
+
+
+def _join_parts(*parts) -> str:
+    return ", ".join(p.strip() for p in parts if p and p.strip())
+
+
+def build_positive_blocks(cfg: dict) -> list:
+    """
+    The positive prompt as ordered (block_name, text) pairs, so the token
+    budget can measure and drop whole blocks.
     FIX: Added .get() with fallback for all cfg keys to prevent KeyError
          when loading old presets missing new fields.
     """
@@ -305,48 +1515,54 @@ def build_positive_prompt(cfg: dict) -> str:
     is_minor = age_group in ("🧒 Child (8-12)", "🧑 Teen (14-17)")
     age_ls   = 1.5
 
-    parts = []
+    blocks = []
+
+    def block(name, *parts):
+        text = _join_parts(*parts)
+        if text:
+            blocks.append((name, text))
 
     # ── BLOCK 1: Quality ──────────────────────────────────
-    parts.append(qp)
+    block("quality", qp)
 
     # ── BLOCK 2: Age Lockdown ─────────────────────────────
     age_L1 = ", ".join(w(tok, age_ls) for tok in age_d["anchor"])
-    parts.append(age_L1)
-    parts.append(w(age_d["age_ref"],  round(age_ls * 0.90, 2)))
-    parts.append(w(age_d["face_ref"], round(age_ls * 0.85, 2)))
+    block("age",
+          age_L1,
+          w(age_d["age_ref"],  round(age_ls * 0.90, 2)),
+          w(age_d["face_ref"], round(age_ls * 0.85, 2)))
 
     # ── BLOCK 3: Art Style ────────────────────────────────
     if style:
-        parts.append(w(style, asw))
+        block("style", w(style, asw))
 
     # ── BLOCK 4: Camera / Composition ────────────────────
     cam_text = CAMERA_ANGLES.get(camera, "")
     if cam_text:
-        parts.append(w(cam_text, 1.1))
+        block("camera", w(cam_text, 1.1))
 
     # ── BLOCK 5: Gender Lockdown ──────────────────────────
     anchors = g["anchor_tokens"]
     effective_gls = min(gls, 1.2) if is_minor else gls
     L1 = ", ".join(w(tok, effective_gls) for tok in anchors)
-    parts.append(L1)
-    parts.append(w(g["body_ref"],  round(effective_gls * 0.80, 2)))
-    parts.append(w(g["face_ref"],  round(effective_gls * 0.75, 2)))
+    block("gender",
+          L1,
+          w(g["body_ref"],  round(effective_gls * 0.80, 2)),
+          w(g["face_ref"],  round(effective_gls * 0.75, 2)))
 
     # ── BLOCK 6: Body Type ────────────────────────────────
     bt = BODY_TYPES.get(body_type, "")
     if bt:
-        parts.append(bt)
+        block("body", bt)
 
     # ── BLOCK 7: Ethnicity Lockdown ───────────────────────
     eth_ls = 1.40
     if eth_d["anchor"]:
-        eth_L1 = ", ".join(w(tok, eth_ls) for tok in eth_d["anchor"])
-        parts.append(eth_L1)
+        eth_parts = [", ".join(w(tok, eth_ls) for tok in eth_d["anchor"])]
         if eth_d["skin_ref"]:
-            parts.append(w(eth_d["skin_ref"], round(eth_ls * 0.88, 2)))
+            eth_parts.append(w(eth_d["skin_ref"], round(eth_ls * 0.88, 2)))
         if eth_d["face_ref"]:
-            parts.append(w(eth_d["face_ref"], round(eth_ls * 0.82, 2)))
+            eth_parts.append(w(eth_d["face_ref"], round(eth_ls * 0.82, 2)))
 
         # Conflict detection: unusual hair/eye for ethnicity → softener
         nat_hair = eth_d.get("natural_hair", [])
@@ -356,41 +1572,36 @@ def build_positive_prompt(cfg: dict) -> str:
         hair_conflict = nat_hair and not any(h in hair_lower for h in nat_hair)
         eye_conflict  = nat_eyes and not any(e in eye_lower  for e in nat_eyes)
         if hair_conflict or eye_conflict:
-            parts.append(
+            eth_parts.append(
                 "fantasy character, unconventional appearance, "
                 "stylized look, artistic character design"
             )
+        block("ethnicity", *eth_parts)
 
     # ── BLOCK 8: Archetype ───────────────────────────────
     arch = ARCHETYPES.get(archetype, "")
     if arch:
-        parts.append(w(arch, 1.1))
+        block("archetype", w(arch, 1.1))
 
     # ── BLOCK 9: Expression ──────────────────────────────
     expr = EXPRESSIONS.get(expression, "")
     if expr:
-        parts.append(w(expr, 1.1))
+        block("expression", w(expr, 1.1))
 
     # ── BLOCK 10: Hair ───────────────────────────────────
     hs = HAIR_STYLES.get(hair_style, "")
     hc = HAIR_COLORS.get(hair_color, "")
-    if hs:
-        parts.append(w(hs, 1.1))
-    if hc:
-        parts.append(w(hc, 1.15))
+    block("hair", w(hs, 1.1) if hs else "", w(hc, 1.15) if hc else "")
 
     # ── BLOCK 11: Eyes ───────────────────────────────────
     es = EYE_STYLES.get(eye_style, "")
     ec = EYE_COLORS.get(eye_color, "")
-    if es:
-        parts.append(w(es, 1.1))
-    if ec:
-        parts.append(w(ec, 1.15))
+    block("eyes", w(es, 1.1) if es else "", w(ec, 1.15) if ec else "")
 
     # ── BLOCK 12: Custom Facial Details ──────────────────
     cf = cfg.get("custom_facial", "").strip()
     if cf:
-        parts.append(cf)
+        block("custom_facial", cf)
 
     # ── BLOCK 13: Outfit ─────────────────────────────────
     outfit_text = OUTFITS.get(outfit, "")
@@ -398,33 +1609,32 @@ def build_positive_prompt(cfg: dict) -> str:
     if extra_outfit:
         outfit_text += f", {extra_outfit}"
     if outfit_text:
-        parts.append(w(outfit_text, 1.05))
+        block("outfit", w(outfit_text, 1.05))
 
     # ── BLOCK 14: Extra Tags ─────────────────────────────
     extra = cfg.get("custom_extra", "").strip()
     if extra:
-        parts.append(extra)
+        block("custom_extra", extra)
 
     # ── BLOCK 15: Lighting ───────────────────────────────
     lt = LIGHTING.get(lighting, "")
     if lt:
-        parts.append(lt)
+        block("lighting", lt)
 
     # ── BLOCK 16: Background ─────────────────────────────
     bg = BACKGROUNDS.get(background, "")
     if bg:
-        parts.append(bg)
+        block("background", bg)
 
     # ── BLOCK 17: Tail Anchors (reinforce in later steps) ─
     tail_weight = round(gls * 0.65, 2)
     gender_tail = ", ".join(w(tok, tail_weight) for tok in anchors[:2])
-    parts.append(gender_tail)
 
     age_tail_w = round(age_ls * 0.60, 2)
     age_tail = ", ".join(w(tok, age_tail_w) for tok in age_d["anchor"][:2])
-    parts.append(age_tail)
+    block("tail", gender_tail, age_tail)
 
-    return ", ".join(p.strip() for p in parts if p and p.strip())
+    return blocks
 
 
 def build_negative_prompt(cfg: dict) -> str:
@@ -449,6 +1659,375 @@ def build_negative_prompt(cfg: dict) -> str:
     return ", ".join(p for p in neg_parts if p and p.strip())
 
 
+# ═══════════════════════════════════════════════════════════
+#  COMPILED PROMPT ENGINE
+#  Same output as build_positive_blocks / build_negative_prompt
+#  (the readable reference), but every weighted fragment and
+#  ethnicity conflict result is computed once per (table, key,
+#  weight) and prompts are assembled by lookups + one join.
+#  This is the hot loop for bulk prompt generation.
+# ═══════════════════════════════════════════════════════════
+
+_DEFAULT_GENDER = "👩 Female"
+_DEFAULT_AGE    = "🌟 Young Adult (18-24)"
+_DEFAULT_ETH    = "🌐 No Preference"
+_MINOR_AGES     = ("🧒 Child (8-12)", "🧑 Teen (14-17)")
+
+
+class CompiledPromptEngine:
+
+    AGE_LOCK = 1.5
+    ETH_LOCK = 1.40
+
+    def __init__(self):
+        self._compiled = False
+        self._lock     = threading.Lock()
+
+    # ── compile (first use) ──────────────────────────────
+    def compile(self):
+        """Precompute every table-key fragment. Idempotent, thread-safe."""
+        with self._lock:
+            if self._compiled:
+                return
+            als = self.AGE_LOCK
+            self._quality = {k: _join_parts(v) for k, v in QUALITY_PRESETS.items()}
+            self._age = {}
+            for key, d in AGE_DATA.items():
+                self._age[key] = (
+                    _join_parts(", ".join(w(t, als) for t in d["anchor"]),
+                                w(d["age_ref"],  round(als * 0.90, 2)),
+                                w(d["face_ref"], round(als * 0.85, 2))),
+                    ", ".join(w(t, round(als * 0.60, 2)) for t in d["anchor"][:2]),
+                )
+            self._camera     = self._weighted(CAMERA_ANGLES, 1.1)
+            self._body       = {k: _join_parts(v) for k, v in BODY_TYPES.items()}
+            self._archetype  = self._weighted(ARCHETYPES, 1.1)
+            self._expression = self._weighted(EXPRESSIONS, 1.1)
+            self._hair_style = self._weighted(HAIR_STYLES, 1.1)
+            self._hair_color = self._weighted(HAIR_COLORS, 1.15)
+            self._eye_style  = self._weighted(EYE_STYLES, 1.1)
+            self._eye_color  = self._weighted(EYE_COLORS, 1.15)
+            self._outfit     = self._weighted(OUTFITS, 1.05)
+            self._lighting   = {k: _join_parts(v) for k, v in LIGHTING.items()}
+            self._background = {k: _join_parts(v) for k, v in BACKGROUNDS.items()}
+
+            # Ethnicity block per (ethnicity, hair colour, eye colour):
+            # the conflict softener is the only cross-table dependency
+            self._ethnicity = {}
+            for eth in ETHNICITY_DATA:
+                for hc in list(HAIR_COLORS) + [None]:
+                    for ec in list(EYE_COLORS) + [None]:
+                        self._ethnicity[(eth, hc, ec)] = self._ethnicity_block(eth, hc, ec)
+
+            self._negative = {}
+            for gender in GENDER_DATA:
+                for age in AGE_DATA:
+                    for eth in ETHNICITY_DATA:
+                        self._negative[(gender, age, eth)] = build_negative_prompt(
+                            {"gender": gender, "age_group": age, "ethnicity": eth}
+                        )
+
+            # Weight-dependent fragments, filled on demand. Weights are
+            # arbitrary floats and keys may be free text, so each memo is
+            # bounded (CCP_PROMPT_MEMO_ENTRIES per memo)
+            size = _env_int("CCP_PROMPT_MEMO_ENTRIES", 4096)
+            self._style  = LRUCache("prompt style",  size, 1 << 62)   # (art_style, asw)
+            self._gender = LRUCache("prompt gender", size, 1 << 62)   # (gender, effective_gls)
+            self._tail   = LRUCache("prompt tail",   size, 1 << 62)   # (gender, gls, age_group)
+            self._hair   = LRUCache("prompt hair",   size, 1 << 62)   # (hair_style, hair_color)
+            self._eyes   = LRUCache("prompt eyes",   size, 1 << 62)   # (eye_style, eye_color)
+            self._compiled = True
+
+    @staticmethod
+    def _weighted(table: dict, weight: float) -> dict:
+        return {k: (_join_parts(w(v, weight)) if v else "") for k, v in table.items()}
+
+    def _ethnicity_block(self, ethnicity, hair_color, eye_color) -> str:
+        eth_d = ETHNICITY_DATA.get(ethnicity, ETHNICITY_DATA[_DEFAULT_ETH])
+        if not eth_d["anchor"]:
+            return ""
+        els = self.ETH_LOCK
+        parts = [", ".join(w(tok, els) for tok in eth_d["anchor"])]
+        if eth_d["skin_ref"]:
+            parts.append(w(eth_d["skin_ref"], round(els * 0.88, 2)))
+        if eth_d["face_ref"]:
+            parts.append(w(eth_d["face_ref"], round(els * 0.82, 2)))
+        nat_hair = eth_d.get("natural_hair", [])
+        nat_eyes = eth_d.get("natural_eyes", [])
+        hair_lower = HAIR_COLORS.get(hair_color, "").lower()
+        eye_lower  = EYE_COLORS.get(eye_color, "").lower()
+        if ((nat_hair and not any(h in hair_lower for h in nat_hair))
+                or (nat_eyes and not any(e in eye_lower for e in nat_eyes))):
+            parts.append(
+                "fantasy character, unconventional appearance, "
+                "stylized look, artistic character design"
+            )
+        return _join_parts(*parts)
+
+    # ── lookups ──────────────────────────────────────────
+    def _memo(self, cache: LRUCache, key, build):
+        text = cache.get(key)
+        if text is None:
+            text = build()
+            cache.put(key, text)
+        return text
+
+    def positive_blocks(self, cfg: dict) -> list:
+        """Same (block_name, text) list as build_positive_blocks(cfg)."""
+        if not self._compiled:
+            self.compile()
+        get = cfg.get
+        gender     = get("gender", _DEFAULT_GENDER)
+        age_group  = get("age_group", _DEFAULT_AGE)
+        ethnicity  = get("ethnicity", _DEFAULT_ETH)
+        art_style  = get("art_style", "🎌 Anime SD1.5")
+        hair_style = get("hair_style", "Long & Flowing")
+        hair_color = get("hair_color", "⬛ Jet Black")
+        eye_style  = get("eye_style", "Natural Realistic")
+        eye_color  = get("eye_color", "🟫 Brown")
+        gls        = get("gender_lock_strength", 1.55)
+        asw        = get("art_style_weight", 1.3)
+
+        age_text, age_tail = self._age.get(age_group) or self._age[_DEFAULT_AGE]
+        effective_gls = min(gls, 1.2) if age_group in _MINOR_AGES else gls
+        g_key = gender if gender in GENDER_DATA else _DEFAULT_GENDER
+
+        blocks = [("quality", self._quality.get(
+            get("quality_preset", "🥇 Maximum"), self._quality["🥇 Maximum"]))]
+        blocks.append(("age", age_text))
+        if ART_STYLES.get(art_style, ""):
+            blocks.append(("style", self._memo(
+                self._style, (art_style, asw),
+                lambda: _join_parts(w(ART_STYLES[art_style], asw)))))
+        cam = self._camera.get(get("camera_angle", "📸 Upper Body (3/4)"), "")
+        if cam:
+            blocks.append(("camera", cam))
+        blocks.append(("gender", self._memo(
+            self._gender, (g_key, effective_gls), lambda: _join_parts(
+                ", ".join(w(t, effective_gls) for t in GENDER_DATA[g_key]["anchor_tokens"]),
+                w(GENDER_DATA[g_key]["body_ref"], round(effective_gls * 0.80, 2)),
+                w(GENDER_DATA[g_key]["face_ref"], round(effective_gls * 0.75, 2)),
+            ))))
+        body = self._body.get(get("body_type", "💪 Athletic"), "")
+        if body:
+            blocks.append(("body", body))
+
+        hc_key = hair_color if hair_color in HAIR_COLORS else None
+        ec_key = eye_color if eye_color in EYE_COLORS else None
+        eth = self._ethnicity.get((ethnicity, hc_key, ec_key))
+        if eth is None:
+            eth = self._ethnicity[(_DEFAULT_ETH, None, None)]
+        if eth:
+            blocks.append(("ethnicity", eth))
+
+        for name, table, key in (
+            ("archetype",  self._archetype,  get("archetype", "None")),
+            ("expression", self._expression, get("expression", "😐 Neutral / Calm")),
+        ):
+            text = table.get(key, "")
+            if text:
+                blocks.append((name, text))
+
+        hair = self._memo(self._hair, (hair_style, hair_color), lambda: _join_parts(
+            self._hair_style.get(hair_style, ""), self._hair_color.get(hair_color, "")))
+        if hair:
+            blocks.append(("hair", hair))
+        eyes = self._memo(self._eyes, (eye_style, eye_color), lambda: _join_parts(
+            self._eye_style.get(eye_style, ""), self._eye_color.get(eye_color, "")))
+        if eyes:
+            blocks.append(("eyes", eyes))
+
+        custom_facial = get("custom_facial", "").strip()
+        if custom_facial:
+            blocks.append(("custom_facial", custom_facial))
+
+        outfit = get("outfit", "⚔️ Fantasy Armor")
+        extra_outfit = get("custom_outfit_extra", "").strip()
+        if extra_outfit:
+            outfit_text = _join_parts(
+                w(OUTFITS.get(outfit, "") + f", {extra_outfit}", 1.05))
+        else:
+            outfit_text = self._outfit.get(outfit, "")
+        if outfit_text:
+            blocks.append(("outfit", outfit_text))
+
+        custom_extra = get("custom_extra", "").strip()
+        if custom_extra:
+            blocks.append(("custom_extra", custom_extra))
+        lighting = self._lighting.get(get("lighting", "🎬 Cinematic Dramatic"), "")
+        if lighting:
+            blocks.append(("lighting", lighting))
+        background = self._background.get(get("background", "⬜ Clean / Studio"), "")
+        if background:
+            blocks.append(("background", background))
+
+        tail = self._memo(self._tail, (g_key, gls, age_tail), lambda: _join_parts(
+            ", ".join(w(t, round(gls * 0.65, 2))
+                      for t in GENDER_DATA[g_key]["anchor_tokens"][:2]),
+            age_tail,
+        ))
+        if tail:
+            blocks.append(("tail", tail))
+        return blocks
+
+    def positive(self, cfg: dict) -> str:
+        """Same text as build_positive_prompt(cfg)."""
+        return ", ".join(text for _, text in self.positive_blocks(cfg))
+
+    def negative(self, cfg: dict) -> str:
+        """Same text as build_negative_prompt(cfg)."""
+        if not self._compiled:
+            self.compile()
+        get = cfg.get
+        base = self._negative.get((get("gender", _DEFAULT_GENDER),
+                                   get("age_group", _DEFAULT_AGE),
+                                   get("ethnicity", _DEFAULT_ETH)))
+        if base is None:
+            return build_negative_prompt(cfg)
+        extra_neg = get("extra_negative", "").strip()
+        return f"{base}, {extra_neg}" if extra_neg else base
+
+
+PROMPT_ENGINE = CompiledPromptEngine()
+
+
+# ═══════════════════════════════════════════════════════════
+#  TOKEN BUDGET — fit the positive into N × 77-token chunks
+#  Every extra chunk is another text-encoder pass and a longer
+#  cross-attention context for every sampling step.
+# ═══════════════════════════════════════════════════════════
+
+# Trimmed first → last when over budget, trailing phrases first
+BUDGET_DROP_ORDER = ("background", "lighting", "tail")
+
+
+def split_prompt_phrases(text: str) -> list:
+    """Split on top-level commas — keeps '(a, b:1.20)' weighted groups whole."""
+    phrases, current, depth = [], [], 0
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        if ch == "," and depth == 0:
+            phrases.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    phrases.append("".join(current).strip())
+    return [p for p in phrases if p]
+
+
+def count_tokens(clip, text: str) -> tuple:
+    """(content tokens, 77-token chunks) using the CLIP's own tokenizer."""
+    family = clip_family(clip)
+    tokens = clip.tokenize(text)
+    if not family.encoders:
+        return 0, 1
+    chunks = tokens[family.encoders[0]]
+    count  = 0
+    for chunk in chunks:
+        for tok in chunk[1:]:
+            if tok[0] == family.end_token:
+                break
+            count += 1
+    return count, len(chunks)
+
+
+# ── Token-budget cache ────────────────────────────────────
+# Fitting re-tokenizes the positive after every dropped phrase, which
+# would cost far more than a warm (cached) encode. The result depends
+# only on the tokenizer, the blocks, the budget and the embeddings, so
+# it is cached on exactly that. Tune with CCP_BUDGET_CACHE_ENTRIES.
+
+BUDGET_CACHE = LRUCache(
+    "token budget",
+    max_entries=_env_int("CCP_BUDGET_CACHE_ENTRIES", 64),
+    max_bytes=1 << 62,
+)
+
+
+def fit_blocks_to_budget(clip, blocks: list, max_chunks: int,
+                         pos_embeds: list = ()) -> tuple:
+    """
+    Drop trailing phrases of the BUDGET_DROP_ORDER blocks until the
+    positive (with its embeddings) fits max_chunks chunks.
+    Returns (blocks, report) — report has per-block token counts.
+    Memoized per tokenizer in BUDGET_CACHE.
+    """
+    owner = getattr(clip, "tokenizer", None) or clip
+    key = (id(owner), tuple(blocks), max_chunks, tuple(pos_embeds))
+    entry = BUDGET_CACHE.get(key)
+    # id() can be recycled once a CLIP is freed — verify the tokenizer
+    if entry is not None and entry[0]() is owner:
+        return list(entry[1]), dict(entry[2])
+
+    fitted, report = _fit_blocks_to_budget_uncached(clip, blocks, max_chunks, pos_embeds)
+    try:
+        BUDGET_CACHE.put(key, (weakref.ref(owner), tuple(fitted), report))
+    except TypeError:
+        pass  # tokenizer not weak-referenceable → don't cache
+    return list(fitted), dict(report)
+
+
+def prompt_chunks(clip, text: str) -> int:
+    """77-token chunk count of text, memoized per tokenizer in BUDGET_CACHE."""
+    owner = getattr(clip, "tokenizer", None) or clip
+    key = ("chunks", id(owner), text)
+    entry = BUDGET_CACHE.get(key)
+    if entry is not None and entry[0]() is owner:
+        return entry[1]
+    chunks = count_tokens(clip, text)[1]
+    try:
+        BUDGET_CACHE.put(key, (weakref.ref(owner), chunks))
+    except TypeError:
+        pass
+    return chunks
+
+
+def _fit_blocks_to_budget_uncached(clip, blocks: list, max_chunks: int,
+                                   pos_embeds: list = ()) -> tuple:
+    def chunks_of(bs):
+        text = inject_embeddings(join_prompt_blocks(bs), "", list(pos_embeds), [])[0]
+        return count_tokens(clip, text)[1]
+
+    report = {
+        "budget":  max_chunks,
+        "tokens":  [(name, count_tokens(clip, text)[0]) for name, text in blocks],
+        "trimmed": {},
+    }
+    blocks = list(blocks)
+    chunks = chunks_of(blocks)
+    for name in BUDGET_DROP_ORDER:
+        while chunks > max_chunks:
+            idx = next((i for i, (n, _) in enumerate(blocks) if n == name), None)
+            if idx is None:
+                break
+            phrases = split_prompt_phrases(blocks[idx][1])[:-1]
+            if phrases:
+                blocks[idx] = (name, ", ".join(phrases))
+            else:
+                del blocks[idx]
+            report["trimmed"][name] = report["trimmed"].get(name, 0) + 1
+            chunks = chunks_of(blocks)
+    report["chunks"] = chunks
+    return blocks, report
+
+
+def format_budget_report(report: dict) -> list:
+    total = sum(n for _, n in report["tokens"])
+    lines = [
+        "  Tokens     : " + " · ".join(f"{name} {n}" for name, n in report["tokens"]),
+        f"  Budget     : {total} tok → {report['chunks']} chunk(s) "
+        f"[max {report['budget']}]",
+    ]
+    if report["trimmed"]:
+        lines.append("  Trimmed    : " + ", ".join(
+            f"{name} -{n}" for name, n in report["trimmed"].items()
+        ))
+    return lines
+
+
 # ═══════════════════════════════════════════════════════════
 #  DATA TABLES
 # ═══════════════════════════════════════════════════════════
@@ -597,7 +2176,6 @@ AGE_DATA = {
     },
 }
 
-AGE_GROUPS = {k: v["age_ref"] for k, v in AGE_DATA.items()}
 
 BODY_TYPES = {
     "💪 Athletic":      "athletic build, toned body, fit physique, defined muscles",
@@ -691,7 +2269,21 @@ ETHNICITY_DATA = {
     },
 }
 
-ETHNICITIES = {k: v["skin_ref"] for k, v in ETHNICITY_DATA.items()}
+# Derived lookups kept for external callers — built on first access
+# (PEP 562) instead of at import.
+_DERIVED_TABLES = {
+    "AGE_GROUPS":  lambda: {k: v["age_ref"] for k, v in AGE_DATA.items()},
+    "ETHNICITIES": lambda: {k: v["skin_ref"] for k, v in ETHNICITY_DATA.items()},
+}
+
+
+def __getattr__(name):
+    build = _DERIVED_TABLES.get(name)
+    if build is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = build()
+    return value
+
 
 HAIR_STYLES = {
     "Short & Neat":       "short neat hair, clean cut",
@@ -977,17 +2569,539 @@ def get_camera_key(camera_angle_full: str) -> str:
     return "Upper Body (3/4)"
 
 
-# ═══════════════════════════════════════════════════════════
-#  MAIN NODE — Character Creator Pro v10.1
-# ═══════════════════════════════════════════════════════════
+def camera_resolution(camera_angle: str, is_sdxl: bool) -> tuple:
+    """(width, height) for a camera angle, rounded to 64px."""
+    res = CAMERA_RESOLUTION.get(get_camera_key(camera_angle), (512, 768, 832, 1216))
+    out_w, out_h = (res[2], res[3]) if is_sdxl else (res[0], res[1])
+    return round(out_w / 64) * 64, round(out_h / 64) * 64
 
-class CharacterCreatorProV10:
-    """
-    Character Creator Pro v10.1
-    ✦ CONDITIONING output — no STRING relay
+
+LATENT_DEVICES = ["cpu", "intermediate", "gpu"]
+LATENT_DTYPES  = ["float32", "model", "float16", "bfloat16"]
+
+def latent_device(name: str = "cpu"):
+    import torch
+    if name == "cpu":
+        return torch.device("cpu")
+    try:
+        import comfy.model_management as mm
+        if name == "intermediate":
+            return mm.intermediate_device()
+        if name == "gpu":
+            return mm.get_torch_device()
+    except Exception as e:
+        print(f"[CharacterCreator] ⚠️  Latent device '{name}' unavailable: {e}")
+    return torch.device("cpu")
+
+
+def latent_dtype(name: str = "float32", model=None):
+    import torch
+    if name == "model":
+        try:
+            return model.model_dtype()
+        except Exception:
+            return torch.float32
+    return getattr(torch, name, torch.float32)
+
+
+def empty_latent(width: int, height: int, batch_size: int = 1,
+                 device: str = "cpu", dtype: str = "float32", model=None) -> dict:
+    """
+    Fresh zeros every call, like EmptyLatentImage — downstream nodes may
+    write into the latent in place, so a shared buffer isn't safe.
+    """
+    import torch
+    shape = (batch_size, 4, height // 8, width // 8)
+    samples = torch.zeros(shape, dtype=latent_dtype(dtype, model),
+                          device=latent_device(device))
+    return {"samples": samples}
+
+
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER PIPELINE HELPERS
+#  Shared by the main node and the batch node.
+# ═══════════════════════════════════════════════════════════
+
+PromptSet = namedtuple("PromptSet", [
+    "positive", "negative", "pos_embeds", "neg_embeds",
+    "budget",   # fit_blocks_to_budget() report, or None
+])
+
+
+def assemble_prompts(cfg: dict, is_sdxl: bool,
+                     clip=None, token_budget: int = 0,
+                     embeddings: bool = True) -> PromptSet:
+    """
+    Final positive / negative text for a character config:
+    weighted prompt + installed embeddings + camera negative tokens.
+    With a clip and token_budget > 0 the positive is fitted to that many
+    77-token chunks. embeddings=False skips the embeddings folder
+    (headless use without ComfyUI).
+    """
+    pos_embeds, neg_embeds = get_available_embeddings(is_sdxl) if embeddings else ([], [])
+
+    blocks = PROMPT_ENGINE.positive_blocks(cfg)
+    budget = None
+    if clip is not None and token_budget > 0:
+        blocks, budget = fit_blocks_to_budget(clip, blocks, token_budget, pos_embeds)
+
+    pos_text = join_prompt_blocks(blocks)
+    neg_text = PROMPT_ENGINE.negative(cfg)
+    pos_text, neg_text = inject_embeddings(pos_text, neg_text, pos_embeds, neg_embeds)
+
+    # Camera-aware negative reinforcement — assembled here so the
+    # final negative (camera + embeddings + base + extra) is encoded once
+    cam_neg = CAMERA_NEGATIVE_TOKENS.get(
+        get_camera_key(cfg.get("camera_angle", "📸 Upper Body (3/4)")), ""
+    )
+    if cam_neg:
+        neg_text = cam_neg + ", " + neg_text
+    return PromptSet(pos_text, neg_text, pos_embeds, neg_embeds, budget)
+
+
+def resolve_character_config(entry) -> dict:
+    """
+    Turn one batch entry into a character config dict.
+    entry may be a preset name (saved or Quick Preset), or a dict of
+    config keys with an optional "preset" key used as the base.
+    """
+    if isinstance(entry, str):
+        entry = {"preset": entry}
+    if not isinstance(entry, dict):
+        raise ValueError(f"character entry must be a name or object, got {entry!r}")
+
+    entry = dict(entry)
+    name  = str(entry.pop("preset", "") or "").strip()
+    cfg   = {}
+    if name:
+        cfg = load_character_preset(name) or dict(QUICK_PRESETS.get(name, {}))
+        if not cfg:
+            raise ValueError(f"unknown preset: {name}")
+        cfg.setdefault("character_name", name)
+    cfg.update(entry)
+    return cfg
+
+
+# ═══════════════════════════════════════════════════════════
+#  IS_CHANGED FINGERPRINT
+#  Hash of what actually determines generate()'s outputs: the character
+#  config with the loaded preset applied, the other output-affecting
+#  widgets, the preset's stored version and the installed LoRA /
+#  embedding files. Object inputs (MODEL, CLIP, ControlNet, image) are
+#  left to ComfyUI's link tracking; save_as_name only has side effects.
+# ═══════════════════════════════════════════════════════════
+
+CHARACTER_KEYS = (
+    "quality_preset", "art_style", "art_style_weight",
+    "gender", "gender_lock_strength", "age_group", "body_type", "ethnicity",
+    "hair_style", "hair_color", "eye_style", "eye_color",
+    "archetype", "expression", "outfit", "lighting", "camera_angle", "background",
+    "character_name", "custom_facial", "custom_outfit_extra", "custom_extra",
+    "extra_negative",
+)
+FINGERPRINT_IGNORED = frozenset(
+    {"model", "clip", "controlnet", "controlnet_image", "save_as_name"}
+)
+
+
+def _file_version(folder: str, name: str) -> tuple:
+    path = folder_paths.get_full_path(folder, name)
+    if path is None:
+        return (name, None)
+    try:
+        st = os.stat(path)
+        return (name, st.st_size, st.st_mtime_ns)
+    except OSError:
+        return (name, None)
+
+
+def character_fingerprint(inputs: dict) -> str:
+    """Stable hex digest of CharacterCreatorProV10 inputs (see above)."""
+    state = {k: v for k, v in inputs.items() if k not in FINGERPRINT_IGNORED}
+
+    preset = state.get("load_preset")
+    if preset and preset != "None":
+        preset_data = load_character_preset(preset)
+        for key in CHARACTER_KEYS:
+            if key in preset_data:
+                state[key] = preset_data[key]
+        try:
+            state["load_preset"] = (preset, PRESET_STORE.version(preset))
+        except Exception:
+            pass
+
+    for slot in (1, 2, 3):
+        lora = state.get(f"lora_{slot}")
+        if not lora or lora == "None":
+            state.pop(f"lora_{slot}_model_str", None)
+            state.pop(f"lora_{slot}_clip_str", None)
+        else:
+            state[f"lora_{slot}"] = _file_version("loras", lora)
+    if state.get("lora_stack") is not None:
+        state["lora_stack"] = [
+            (_file_version("loras", name), ms, cs)
+            for name, ms, cs in lora_stack_entries(state["lora_stack"])
+        ]
+
+    try:
+        state["_embeddings"] = EMBEDDING_INVENTORY.version()
+    except Exception:
+        pass
+
+    try:
+        blob = json.dumps(state, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        blob = repr(sorted(state.items(), key=lambda kv: kv[0]))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER PIPELINE STAGES
+#  The steps of generate() as standalone functions, shared by
+#  CharacterCreatorPro and the stage nodes further down
+#  (config → prompt → LoRA stack → encode → latent).
+#  A CHARACTER value is the plain config dict (CHARACTER_KEYS).
+# ═══════════════════════════════════════════════════════════
+
+def _preset_inputs() -> dict:
+    return {
+        "load_preset":  (list_character_presets(), {"default": "None"}),
+        "save_as_name": ("STRING", {
+            "default": "",
+            "placeholder": "اسم الحفظ (اتركه فارغاً لعدم الحفظ)"
+        }),
+    }
+
+
+def _appearance_inputs() -> dict:
+    return {
+        # ── Quality ──────────────────────────────
+        "quality_preset":   (list(QUALITY_PRESETS.keys()), {"default": "🥇 Maximum"}),
+        "art_style":        (list(ART_STYLES.keys()),       {"default": "🎌 Anime SD1.5"}),
+        "art_style_weight": ("FLOAT", {
+            "default": 1.3, "min": 0.8, "max": 1.8,
+            "step": 0.05, "display": "slider"
+        }),
+
+        # ── Gender Lockdown ──────────────────────
+        "gender": (list(GENDER_DATA.keys()), {"default": "👩 Female"}),
+        "gender_lock_strength": ("FLOAT", {
+            "default": 1.55, "min": 1.0, "max": 2.0,
+            "step": 0.05, "display": "slider"
+        }),
+
+        # ── Identity ─────────────────────────────
+        "age_group": (list(AGE_DATA.keys()),       {"default": "🌟 Young Adult (18-24)"}),
+        "body_type": (list(BODY_TYPES.keys()),     {"default": "💪 Athletic"}),
+        "ethnicity": (list(ETHNICITY_DATA.keys()), {"default": "🇯🇵 East Asian"}),
+
+        # ── Hair ─────────────────────────────────
+        "hair_style": (list(HAIR_STYLES.keys()), {"default": "Long & Flowing"}),
+        "hair_color": (list(HAIR_COLORS.keys()), {"default": "⬛ Jet Black"}),
+
+        # ── Eyes ─────────────────────────────────
+        "eye_style": (list(EYE_STYLES.keys()), {"default": "Large Anime"}),
+        "eye_color": (list(EYE_COLORS.keys()), {"default": "🔵 Blue"}),
+
+        # ── Character ────────────────────────────
+        "archetype":  (list(ARCHETYPES.keys()),  {"default": "⚔️ Hero / Warrior"}),
+        "expression": (list(EXPRESSIONS.keys()), {"default": "😤 Fierce / Determined"}),
+        "outfit":     (list(OUTFITS.keys()),      {"default": "⚔️ Fantasy Armor"}),
+
+        # ── Scene ────────────────────────────────
+        "lighting":     (list(LIGHTING.keys()),       {"default": "🎬 Cinematic Dramatic"}),
+        "camera_angle": (list(CAMERA_ANGLES.keys()),  {"default": "📸 Upper Body (3/4)"}),
+        "background":   (list(BACKGROUNDS.keys()),    {"default": "🏔️ Epic Fantasy Land"}),
+    }
+
+
+def _seed_inputs() -> dict:
+    return {
+        "base_seed": ("INT", {"default": 42, "min": 0, "max": 0xFFFFFFFF}),
+        "use_char_seed": ("BOOLEAN", {
+            "default": True,
+            "label_on":  "Character DNA Seed",
+            "label_off": "Use Base Seed Only"
+        }),
+    }
+
+
+LORA_SLOT_DEFAULTS = (0.8, 0.6, 0.5)
+
+
+def _lora_strength_input(default: float) -> tuple:
+    return ("FLOAT", {
+        "default": default, "min": -2.0, "max": 2.0,
+        "step": 0.05, "display": "slider"
+    })
+
+
+def _lora_inputs() -> dict:
+    lora_list = INPUT_SPEC_CACHE.lora_list()
+    inputs = {}
+    for slot, default in enumerate(LORA_SLOT_DEFAULTS, 1):
+        inputs[f"lora_{slot}"] = (lora_list, {"default": "None"})
+        for side in ("model", "clip"):
+            inputs[f"lora_{slot}_{side}_str"] = _lora_strength_input(default)
+    return inputs
+
+
+def _lora_stack_input() -> dict:
+    # LORA_STACK: list of (lora_name, model_str, clip_str), applied after
+    # the three slots. Any number of entries (CharacterLoraStack).
+    return {"lora_stack": ("LORA_STACK",)}
+
+
+def _controlnet_strength_input() -> dict:
+    return {
+        "controlnet_strength": ("FLOAT", {
+            "default": 0.8, "min": 0.0, "max": 1.0,
+            "step": 0.05, "display": "slider"
+        }),
+    }
+
+
+def _detail_inputs() -> dict:
+    return {
+        "character_name":      ("STRING", {
+            "default": "", "placeholder": "اسم الشخصية..."
+        }),
+        "custom_facial":       ("STRING", {
+            "default": "", "multiline": True,
+            "placeholder": "ندوب، وشوم، مجوهرات..."
+        }),
+        "custom_outfit_extra": ("STRING", {
+            "default": "", "multiline": True,
+            "placeholder": "تفاصيل الزي..."
+        }),
+        "custom_extra":        ("STRING", {
+            "default": "", "multiline": True,
+            "placeholder": "تفاصيل إضافية..."
+        }),
+        "extra_negative":      ("STRING", {
+            "default": "", "multiline": True,
+            "placeholder": "Negative إضافية..."
+        }),
+    }
+
+
+def _latent_inputs() -> dict:
+    return {
+        "batch_size":    ("INT", {"default": 1, "min": 1, "max": 64}),
+        "latent_device": (LATENT_DEVICES, {"default": "cpu"}),
+        "latent_dtype":  (LATENT_DTYPES,  {"default": "float32"}),
+    }
+
+
+def _token_budget_input() -> dict:
+    # Max 77-token CLIP chunks for the positive; lighting,
+    # background and tail anchors are trimmed to fit.
+    return {"token_budget": ("INT", {"default": 0, "min": 0, "max": 8})}
+
+
+def resolve_character(load_preset: str, widgets: dict) -> dict:
+    """Character config from widget values, overridden by a loaded preset."""
+    cfg = {key: widgets[key] for key in CHARACTER_KEYS}
+    preset_data = load_character_preset(load_preset)
+    for key in CHARACTER_KEYS:
+        if key in preset_data:
+            cfg[key] = preset_data[key]
+    return cfg
+
+
+def final_character_seed(cfg: dict, base_seed: int, use_char_seed: bool) -> int:
+    name = cfg.get("character_name", "")
+    if use_char_seed and name.strip():
+        return character_seed(name, cfg.get("gender", ""), cfg.get("ethnicity", ""), base_seed)
+    return base_seed
+
+
+def save_character(save_as_name: str, cfg: dict, loras: list = ()) -> str:
+    """
+    Save cfg as a preset if a name is given; returns the debug status.
+    loras (name, model_str, clip_str) are stored merged under "loras",
+    where Character Roster reads (and prefetches) them.
+    """
+    if not save_as_name.strip():
+        return "—"
+    data = dict(cfg)
+    merged = [[n, ms, cs] for n, ms, cs in merge_lora_stack(loras) if ms or cs]
+    if merged:
+        data["loras"] = merged
+    saved = save_character_preset(save_as_name.strip(), data)
+    return f"✅ Saved: {save_as_name}" if saved else "❌ Save failed"
+
+
+def lora_slots(kwargs: dict) -> list:
+    """[(name, model_str, clip_str)] for the lora_1..3 widgets."""
+    return [
+        (kwargs[f"lora_{slot}"], kwargs[f"lora_{slot}_model_str"], kwargs[f"lora_{slot}_clip_str"])
+        for slot in (1, 2, 3)
+    ]
+
+
+def lora_stack_entries(lora_stack) -> list:
+    """[(name, model_str, clip_str)] from a LORA_STACK input (None → [])."""
+    return [
+        (str(name), float(strength_model), float(strength_clip))
+        for name, strength_model, strength_clip in (lora_stack or ())
+    ]
+
+
+def apply_lora_slots(model, clip, slots: list) -> tuple:
+    return apply_lora_stack(model, clip, slots)
+
+
+def encode_character_prompts(clip, prompts: PromptSet) -> tuple:
+    """
+    (positive, negative) CONDITIONING for a PromptSet. Under a token
+    budget both sides are padded to the longer side's chunk count so the
+    sampler doesn't repeat conditioning per step.
+    """
+    pad = 0
+    if prompts.budget:
+        pad = max(prompt_chunks(clip, prompts.positive),
+                  prompt_chunks(clip, prompts.negative))
+    positive = encode_prompt(clip, prompts.positive, pad_to_chunks=pad)
+    negative = encode_prompt(clip, prompts.negative, pad_to_chunks=pad)
+    return positive, negative
+
+
+def _controlnet_inputs() -> dict:
+    # Lazy: the upstream branch (image load, preprocessor, …) only runs
+    # when check_lazy_status() asks for it — see controlnet_lazy_status()
+    return {
+        "controlnet":       ("CONTROL_NET", {"lazy": True}),
+        "controlnet_image": ("IMAGE",       {"lazy": True}),
+    }
+
+
+def controlnet_lazy_status(inputs: dict) -> list:
+    """
+    Lazy inputs to request: both ControlNet inputs, only when both are
+    connected (ComfyUI omits unconnected ones and passes not-yet-evaluated
+    ones as None) and controlnet_strength > 0.
+    """
+    names = ("controlnet", "controlnet_image")
+    if inputs.get("controlnet_strength", 0) <= 0 or any(n not in inputs for n in names):
+        return []
+    return [n for n in names if inputs[n] is None]
+
+
+# ── ControlNet hint cache ──────────────────────────────────
+# A series reuses one pose / depth image for every run. Keep the prepared
+# hint (IMAGE → [B, C, H, W], resized to the output resolution) keyed by
+# image content, resolution and ControlNet. The content digest itself is
+# memoised per tensor object + storage + shape, so an unchanged LoadImage
+# output isn't re-hashed either. Tune with CCP_HINT_CACHE_ENTRIES /
+# CCP_HINT_CACHE_MB.
+
+HINT_CACHE = LRUCache(
+    "controlnet hints",
+    max_entries=_env_int("CCP_HINT_CACHE_ENTRIES", 8),
+    max_bytes=_env_int("CCP_HINT_CACHE_MB", 256) * 2**20,
+    sizeof=lambda entry: _tensor_nbytes(entry[1]),
+)
+_IMAGE_DIGESTS = LRUCache("image digests", max_entries=32, max_bytes=1 << 62)
+
+
+def image_digest(image) -> str:
+    """
+    Content hash of an IMAGE tensor (shape, dtype and pixels). Tensors
+    made under torch.inference_mode() — everything ComfyUI's executor
+    produces — have no version counter, so an in-place edit of one is
+    not seen by the memo; other tensors are re-hashed after one.
+    """
+    import torch
+    version = None if image.is_inference() else image._version
+    memo_key = (id(image), image.data_ptr(), tuple(image.shape), version)
+    entry = _IMAGE_DIGESTS.peek(memo_key)
+    if entry is not None and entry[0]() is image:
+        return entry[1]
+    pixels = image.detach().cpu().contiguous()
+    digest = hashlib.sha1(f"{tuple(pixels.shape)}|{pixels.dtype}".encode())
+    digest.update(pixels.view(-1).view(torch.uint8).numpy().data)
+    digest = digest.hexdigest()
+    try:
+        _IMAGE_DIGESTS.put(memo_key, (weakref.ref(image), digest))
+    except TypeError:
+        pass
+    return digest
+
+
+def controlnet_hint(image, controlnet, width: int = None, height: int = None):
+    """
+    Prepared ControlNet hint for image: channels-first and, when width /
+    height are given, resized the way ComfyUI resizes hints at sampling
+    time — so that step becomes a no-op. Served from HINT_CACHE.
+    """
+    key = (image_digest(image), width, height, id(controlnet))
+    entry = HINT_CACHE.get(key)
+    # id() can be recycled once a ControlNet is freed — verify it
+    if entry is not None and entry[0]() is controlnet:
+        return entry[1]
+
+    hint = image.movedim(-1, 1)
+    if width and height and tuple(hint.shape[-2:]) != (height, width):
+        import comfy.utils
+        hint = comfy.utils.common_upscale(
+            hint, width, height,
+            getattr(controlnet, "upscale_algorithm", "nearest-exact"), "center",
+        )
+    hint = hint.contiguous()
+    try:
+        HINT_CACHE.put(key, (weakref.ref(controlnet), hint))
+    except TypeError:
+        pass  # ControlNet not weak-referenceable → don't cache
+    return hint
+
+
+def apply_character_controlnet(positive, negative, controlnet, image, strength: float,
+                               width: int = None, height: int = None) -> tuple:
+    """
+    (positive, negative) with the ControlNet attached to both, like
+    ComfyUI's Apply ControlNet (Advanced): one prepared hint, one
+    ControlNet copy per previous ControlNet in the chain.
+    """
+    if controlnet is None or image is None or strength <= 0:
+        return positive, negative
+    hint = controlnet_hint(image, controlnet, width, height)
+    try:
+        cnets = {}
+        out = []
+        for conditioning in (positive, negative):
+            c = []
+            for t in conditioning:
+                d = t[1].copy()
+                prev_cnet = d.get("control", None)
+                if prev_cnet not in cnets:
+                    c_net = controlnet.copy().set_cond_hint(hint, strength, (0.0, 1.0))
+                    c_net.set_previous_controlnet(prev_cnet)
+                    cnets[prev_cnet] = c_net
+                d["control"] = cnets[prev_cnet]
+                d["control_apply_to_uncond"] = False
+                c.append([t[0], d])
+            out.append(c)
+        return out[0], out[1]
+    except (AttributeError, TypeError) as e:
+        # Not a ComfyUI ControlNet (no copy / set_cond_hint chain)
+        print(f"[CharacterCreator] ⚠️  ControlNet apply error: {e}")
+        return positive, negative
+
+
+# ═══════════════════════════════════════════════════════════
+#  MAIN NODE — Character Creator Pro v10.1
+#  Convenience wrapper: every stage in one node. Use the stage
+#  nodes to let ComfyUI cache each stage separately.
+# ═══════════════════════════════════════════════════════════
+
+class CharacterCreatorProV10:
+    """
+    Character Creator Pro v10.1
+    ✦ CONDITIONING output — no STRING relay
     ✦ SD 1.5 + SDXL unified encoding
     ✦ Triple-layer Gender / Age / Ethnicity Lockdown
-    ✦ LoRA injection (3 slots)
+    ✦ LoRA stack (3 slots + LORA_STACK input)
     ✦ ControlNet optional input
     ✦ Upscale model pass-through
     ✦ Character save / load presets
@@ -1010,9 +3124,8 @@ class CharacterCreatorProV10:
     OUTPUT_NODE = False
 
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
-        lora_list    = ["None"] + folder_paths.get_filename_list("loras")
-        preset_list  = list_character_presets()
         return {
             "required": {
                 # ── Inputs ──────────────────────────────
@@ -1020,90 +3133,16 @@ class CharacterCreatorProV10:
                 "clip":  ("CLIP",),
 
                 # ── Preset System ────────────────────────
-                "load_preset":  (preset_list, {"default": "None"}),
-                "save_as_name": ("STRING", {
-                    "default": "",
-                    "placeholder": "اسم الحفظ (اتركه فارغاً لعدم الحفظ)"
-                }),
+                **_preset_inputs(),
 
-                # ── Quality ──────────────────────────────
-                "quality_preset":   (list(QUALITY_PRESETS.keys()), {"default": "🥇 Maximum"}),
-                "art_style":        (list(ART_STYLES.keys()),       {"default": "🎌 Anime SD1.5"}),
-                "art_style_weight": ("FLOAT", {
-                    "default": 1.3, "min": 0.8, "max": 1.8,
-                    "step": 0.05, "display": "slider"
-                }),
-
-                # ── Gender Lockdown ──────────────────────
-                "gender": (list(GENDER_DATA.keys()), {"default": "👩 Female"}),
-                "gender_lock_strength": ("FLOAT", {
-                    "default": 1.55, "min": 1.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
-
-                # ── Identity ─────────────────────────────
-                "age_group": (list(AGE_GROUPS.keys()),  {"default": "🌟 Young Adult (18-24)"}),
-                "body_type": (list(BODY_TYPES.keys()),  {"default": "💪 Athletic"}),
-                "ethnicity": (list(ETHNICITIES.keys()), {"default": "🇯🇵 East Asian"}),
-
-                # ── Hair ─────────────────────────────────
-                "hair_style": (list(HAIR_STYLES.keys()), {"default": "Long & Flowing"}),
-                "hair_color": (list(HAIR_COLORS.keys()), {"default": "⬛ Jet Black"}),
-
-                # ── Eyes ─────────────────────────────────
-                "eye_style": (list(EYE_STYLES.keys()), {"default": "Large Anime"}),
-                "eye_color": (list(EYE_COLORS.keys()), {"default": "🔵 Blue"}),
-
-                # ── Character ────────────────────────────
-                "archetype":  (list(ARCHETYPES.keys()),  {"default": "⚔️ Hero / Warrior"}),
-                "expression": (list(EXPRESSIONS.keys()), {"default": "😤 Fierce / Determined"}),
-                "outfit":     (list(OUTFITS.keys()),      {"default": "⚔️ Fantasy Armor"}),
-
-                # ── Scene ────────────────────────────────
-                "lighting":     (list(LIGHTING.keys()),       {"default": "🎬 Cinematic Dramatic"}),
-                "camera_angle": (list(CAMERA_ANGLES.keys()),  {"default": "📸 Upper Body (3/4)"}),
-                "background":   (list(BACKGROUNDS.keys()),    {"default": "🏔️ Epic Fantasy Land"}),
+                # ── Quality / Identity / Scene ───────────
+                **_appearance_inputs(),
 
                 # ── Seed Management ──────────────────────
-                "base_seed": ("INT", {"default": 42, "min": 0, "max": 0xFFFFFFFF}),
-                "use_char_seed": ("BOOLEAN", {
-                    "default": True,
-                    "label_on":  "Character DNA Seed",
-                    "label_off": "Use Base Seed Only"
-                }),
-
-                # ── LoRA Slot 1 ──────────────────────────
-                "lora_1":           (lora_list, {"default": "None"}),
-                "lora_1_model_str": ("FLOAT", {
-                    "default": 0.8, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
-                "lora_1_clip_str":  ("FLOAT", {
-                    "default": 0.8, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
+                **_seed_inputs(),
 
-                # ── LoRA Slot 2 ──────────────────────────
-                "lora_2":           (lora_list, {"default": "None"}),
-                "lora_2_model_str": ("FLOAT", {
-                    "default": 0.6, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
-                "lora_2_clip_str":  ("FLOAT", {
-                    "default": 0.6, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
-
-                # ── LoRA Slot 3 ──────────────────────────
-                "lora_3":           (lora_list, {"default": "None"}),
-                "lora_3_model_str": ("FLOAT", {
-                    "default": 0.5, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
-                "lora_3_clip_str":  ("FLOAT", {
-                    "default": 0.5, "min": -2.0, "max": 2.0,
-                    "step": 0.05, "display": "slider"
-                }),
+                # ── LoRA Slots 1-3 ───────────────────────
+                **_lora_inputs(),
 
                 # ── ControlNet strength (widget — must be in required) ───
                 # NOTE: controlnet / controlnet_image are IMAGE/CONTROL_NET
@@ -1112,221 +3151,147 @@ class CharacterCreatorProV10:
                 # widget. Keeping it in optional would insert it BEFORE the
                 # STRING optional widgets in widgets_values, corrupting the
                 # slot order and causing "could not convert string to float".
-                "controlnet_strength": ("FLOAT", {
-                    "default": 0.8, "min": 0.0, "max": 1.0,
-                    "step": 0.05, "display": "slider"
-                }),
+                **_controlnet_strength_input(),
 
                 # ── Character Details (widgets) ──────────
-                "character_name":      ("STRING", {
-                    "default": "", "placeholder": "اسم الشخصية..."
-                }),
-                "custom_facial":       ("STRING", {
-                    "default": "", "multiline": True,
-                    "placeholder": "ندوب، وشوم، مجوهرات..."
-                }),
-                "custom_outfit_extra": ("STRING", {
-                    "default": "", "multiline": True,
-                    "placeholder": "تفاصيل الزي..."
-                }),
-                "custom_extra":        ("STRING", {
-                    "default": "", "multiline": True,
-                    "placeholder": "تفاصيل إضافية..."
-                }),
-                "extra_negative":      ("STRING", {
-                    "default": "", "multiline": True,
-                    "placeholder": "Negative إضافية..."
-                }),
+                **_detail_inputs(),
+
+                # ── Token budget (0 = off) ───────────────
+                **_token_budget_input(),
+
+                # ── Latent batch / placement ─────────────
+                **_latent_inputs(),
             },
             "optional": {
                 # Only non-widget types here (CONTROL_NET, IMAGE).
                 # FLOAT/STRING in optional get serialised as widgets and
                 # corrupt the widgets_values slot order → moved to required.
-                "controlnet":       ("CONTROL_NET",),
-                "controlnet_image": ("IMAGE",),
+                **_controlnet_inputs(),
+                **_lora_stack_input(),
             }
         }
 
+    def check_lazy_status(self, **kwargs):
+        return controlnet_lazy_status(kwargs)
+
     def generate(
         self,
         model, clip,
         load_preset, save_as_name,
-        quality_preset, art_style, art_style_weight,
-        gender, gender_lock_strength,
-        age_group, body_type, ethnicity,
-        hair_style, hair_color,
-        eye_style, eye_color,
-        archetype, expression, outfit,
-        lighting, camera_angle, background,
         base_seed, use_char_seed,
-        lora_1, lora_1_model_str, lora_1_clip_str,
-        lora_2, lora_2_model_str, lora_2_clip_str,
-        lora_3, lora_3_model_str, lora_3_clip_str,
         controlnet_strength,
-        character_name, custom_facial,
-        custom_outfit_extra, custom_extra, extra_negative,
+        token_budget=0,
+        batch_size=1, latent_device="cpu", latent_dtype="float32",
         controlnet=None, controlnet_image=None,
+        lora_stack=None,
+        **widgets,
     ):
-        # ── 1. Load preset if selected ─────────────────────
-        preset_data = load_character_preset(load_preset)
-        if preset_data:
-            quality_preset       = preset_data.get("quality_preset",       quality_preset)
-            art_style            = preset_data.get("art_style",            art_style)
-            art_style_weight     = preset_data.get("art_style_weight",     art_style_weight)
-            gender               = preset_data.get("gender",               gender)
-            gender_lock_strength = preset_data.get("gender_lock_strength", gender_lock_strength)
-            age_group            = preset_data.get("age_group",            age_group)
-            body_type            = preset_data.get("body_type",            body_type)
-            ethnicity            = preset_data.get("ethnicity",            ethnicity)
-            hair_style           = preset_data.get("hair_style",           hair_style)
-            hair_color           = preset_data.get("hair_color",           hair_color)
-            eye_style            = preset_data.get("eye_style",            eye_style)
-            eye_color            = preset_data.get("eye_color",            eye_color)
-            archetype            = preset_data.get("archetype",            archetype)
-            expression           = preset_data.get("expression",           expression)
-            outfit               = preset_data.get("outfit",               outfit)
-            lighting             = preset_data.get("lighting",             lighting)
-            camera_angle         = preset_data.get("camera_angle",         camera_angle)
-            background           = preset_data.get("background",           background)
-            character_name       = preset_data.get("character_name",       character_name)
-            custom_facial        = preset_data.get("custom_facial",        custom_facial)
-            custom_outfit_extra  = preset_data.get("custom_outfit_extra",  custom_outfit_extra)
-            custom_extra         = preset_data.get("custom_extra",         custom_extra)
-            extra_negative       = preset_data.get("extra_negative",       extra_negative)
-
-        # ── 2. Apply LoRAs ─────────────────────────────────
-        model, clip = apply_lora(model, clip, lora_1, lora_1_model_str, lora_1_clip_str)
-        model, clip = apply_lora(model, clip, lora_2, lora_2_model_str, lora_2_clip_str)
-        model, clip = apply_lora(model, clip, lora_3, lora_3_model_str, lora_3_clip_str)
-
-        # ── 3. Build config dict ───────────────────────────
-        cfg = {
-            "quality_preset":       quality_preset,
-            "art_style":            art_style,
-            "art_style_weight":     art_style_weight,
-            "gender":               gender,
-            "gender_lock_strength": gender_lock_strength,
-            "age_group":            age_group,
-            "body_type":            body_type,
-            "ethnicity":            ethnicity,
-            "hair_style":           hair_style,
-            "hair_color":           hair_color,
-            "eye_style":            eye_style,
-            "eye_color":            eye_color,
-            "archetype":            archetype,
-            "expression":           expression,
-            "outfit":               outfit,
-            "lighting":             lighting,
-            "camera_angle":         camera_angle,
-            "background":           background,
-            "character_name":       character_name,
-            "custom_facial":        custom_facial,
-            "custom_outfit_extra":  custom_outfit_extra,
-            "custom_extra":         custom_extra,
-            "extra_negative":       extra_negative,
-        }
-
-        # ── 4. Build prompts ───────────────────────────────
-        pos_text = build_positive_prompt(cfg)
-        neg_text = build_negative_prompt(cfg)
-
-        # ── 5. Detect model type ───────────────────────────
-        is_sdxl = _detect_sdxl(clip)
-
-        # ── 5a. Auto-inject embeddings ─────────────────────
-        pos_embeds, neg_embeds = get_available_embeddings(is_sdxl)
-        pos_text, neg_text = inject_embeddings(pos_text, neg_text, pos_embeds, neg_embeds)
-
-        # ── 5b. Encode ─────────────────────────────────────
-        positive_cond = encode_prompt(clip, pos_text)
-        negative_cond = encode_prompt(clip, neg_text)
-
-        # ── 5c. ControlNet conditioning ───────────────────
-        if controlnet is not None and controlnet_image is not None:
-            try:
-                import comfy.sd as comfy_sd
-                positive_cond = comfy_sd.apply_controlnet(
-                    positive_cond, controlnet,
-                    controlnet_image, controlnet_strength
-                )
-            except Exception as e:
-                print(f"[CharacterCreator] ⚠️  ControlNet apply error: {e}")
+        timer = StageTimer("CharacterCreatorPro")
+
+        # ── 1. Load preset + build config ──────────────────
+        cfg = resolve_character(load_preset, widgets)
+        timer.mark("1. preset load")
+
+        # ── 2. Apply LoRAs (slots 1-3 + LORA_STACK) ────────
+        slots = lora_slots(widgets) + lora_stack_entries(lora_stack)
+        model, clip = apply_lora_slots(model, clip, slots)
+        timer.mark("2. LoRAs")
+
+        # ── 3. Detect model type ───────────────────────────
+        is_sdxl = clip_family(clip).is_sdxl
+
+        # ── 4. Prompts + embeddings + camera negative ──────
+        prompts = assemble_prompts(cfg, is_sdxl, clip, token_budget)
+        pos_text, neg_text, pos_embeds, neg_embeds, budget = prompts
+        timer.mark("3-4. prompts")
+
+        # ── 5a. Encode ─────────────────────────────────────
+        positive_cond, negative_cond = encode_character_prompts(clip, prompts)
+        timer.mark("5a. encode")
+
+        # ── 5b. ControlNet conditioning (hint at output resolution) ──
+        out_w, out_h = camera_resolution(cfg["camera_angle"], is_sdxl)
+        hint_hits = HINT_CACHE.hits
+        positive_cond, negative_cond = apply_character_controlnet(
+            positive_cond, negative_cond, controlnet, controlnet_image,
+            controlnet_strength, out_w, out_h,
+        )
+        timer.mark("5b. controlnet")
 
-        # ── 5d. Dynamic CFG + Sampler recommendation ───────
-        rec_sampler, rec_scheduler, rec_steps, rec_cfg = get_sampler_preset(art_style)
+        # ── 5c. Dynamic CFG + Sampler recommendation ───────
+        rec_sampler, rec_scheduler, rec_steps, rec_cfg = get_sampler_preset(cfg["art_style"])
 
         # ── 6. Seed management ─────────────────────────────
-        if use_char_seed and character_name.strip():
-            final_seed = character_seed(character_name, gender, ethnicity, base_seed)
-        else:
-            final_seed = base_seed
+        final_seed = final_character_seed(cfg, base_seed, use_char_seed)
+        timer.mark("5c-6. sampler+seed")
 
         # ── 7. Save preset ─────────────────────────────────
-        if save_as_name.strip():
-            cfg["character_name"] = character_name
-            saved = save_character_preset(save_as_name.strip(), cfg)
-            save_status = f"✅ Saved: {save_as_name}" if saved else "❌ Save failed"
-        else:
-            save_status = "—"
+        save_status = save_character(save_as_name, cfg, slots)
+        timer.mark("7. preset save")
 
-        # ── 8. Smart Resolution ────────────────────────────
-        import torch
-        cam_key = get_camera_key(camera_angle)
-        res = CAMERA_RESOLUTION.get(cam_key, (512, 768, 832, 1216))
-        out_w, out_h = (res[2], res[3]) if is_sdxl else (res[0], res[1])
-        out_w = round(out_w / 64) * 64
-        out_h = round(out_h / 64) * 64
-
-        latent_tensor = torch.zeros(
-            [1, 4, out_h // 8, out_w // 8], dtype=torch.float32
+        # ── 8. Latent at the smart resolution ─────────────
+        latent_out = empty_latent(
+            out_w, out_h, batch_size, latent_device, latent_dtype, model
         )
-        latent_out = {"samples": latent_tensor}
-
-        # ── 9. Camera-aware negative reinforcement ─────────
-        cam_neg = CAMERA_NEGATIVE_TOKENS.get(cam_key, "")
-        if cam_neg:
-            negative_cond = encode_prompt(clip, cam_neg + ", " + neg_text)
-
-        # ── 10. Debug info ─────────────────────────────────
-        lora_info = []
-        for slot, name, ms, cs in [
-            (1, lora_1, lora_1_model_str, lora_1_clip_str),
-            (2, lora_2, lora_2_model_str, lora_2_clip_str),
-            (3, lora_3, lora_3_model_str, lora_3_clip_str),
-        ]:
-            if name != "None":
-                lora_info.append(f"  LoRA {slot}  : {name} [{ms}/{cs}]")
+        timer.mark("8. latent")
+
+        # ── 9. Debug info ──────────────────────────────────
+        lora_info = [
+            f"  LoRA {slot}  : {name} [{ms}/{cs}]"
+            for slot, (name, ms, cs) in enumerate(slots, 1)
+            if name != "None"
+        ]
 
         cn_info = ""
-        if controlnet is not None:
-            cn_info = f"  ControlNet : strength={controlnet_strength}"
+        if controlnet is not None and controlnet_image is not None and controlnet_strength > 0:
+            cn_info = (
+                f"  ControlNet : strength={controlnet_strength} · hint "
+                f"{'cached' if HINT_CACHE.hits > hint_hits else 'prepared'} "
+                f"({HINT_CACHE.stats()})"
+            )
 
         debug = "\n".join(filter(None, [
             "╔══ CHARACTER CREATOR PRO v10.1 ══╗",
-            f"  Name       : {character_name or '—'}",
+            f"  Name       : {cfg['character_name'] or '—'}",
             f"  Preset     : {load_preset} | Save: {save_status}",
-            f"  Gender     : {gender} [lock: {gender_lock_strength}]",
-            f"  Age        : {age_group}",
-            f"  Ethnicity  : {ethnicity}",
-            f"  Style      : {art_style} [w:{art_style_weight}]",
-            f"  Archetype  : {archetype}",
-            f"  Hair       : {hair_style} / {hair_color}",
-            f"  Eyes       : {eye_style} / {eye_color}",
-            f"  Outfit     : {outfit}",
-            f"  Light      : {lighting}",
-            f"  Camera     : {camera_angle}",
+            f"  Gender     : {cfg['gender']} [lock: {cfg['gender_lock_strength']}]",
+            f"  Age        : {cfg['age_group']}",
+            f"  Ethnicity  : {cfg['ethnicity']}",
+            f"  Style      : {cfg['art_style']} [w:{cfg['art_style_weight']}]",
+            f"  Archetype  : {cfg['archetype']}",
+            f"  Hair       : {cfg['hair_style']} / {cfg['hair_color']}",
+            f"  Eyes       : {cfg['eye_style']} / {cfg['eye_color']}",
+            f"  Outfit     : {cfg['outfit']}",
+            f"  Light      : {cfg['lighting']}",
+            f"  Camera     : {cfg['camera_angle']}",
             f"  Seed       : {final_seed} {'(DNA sha256)' if use_char_seed else '(base)'}",
             f"  Res        : {out_w}x{out_h} ({'SDXL' if is_sdxl else 'SD1.5'})",
+            f"  Latent     : {list(latent_out['samples'].shape)} "
+            f"{str(latent_out['samples'].dtype).replace('torch.', '')} "
+            f"on {latent_out['samples'].device}",
             f"  CFG/Steps  : {rec_cfg} / {rec_steps} ({rec_sampler}/{rec_scheduler})",
             f"  Embeds+    : {pos_embeds or 'none'}",
             f"  Embeds-    : {neg_embeds or 'none'}",
+            f"  Cond cache : {COND_CACHE.stats()}",
+            f"  LoRA cache : {LORA_CACHE.stats()}",
+            f"  LoRA pairs : {LORA_PAIR_CACHE.stats()}",
             cn_info,
             *lora_info,
             "  ─────────────────────────────────",
             f"  +Prompt    : {len(pos_text)} chars",
             f"  -Prompt    : {len(neg_text)} chars",
+            *(format_budget_report(budget) if budget else []),
+            *timer.report(),
             "╚═════════════════════════════════╝",
         ]))
+        timer.log(
+            character=cfg["character_name"], preset=load_preset, saved=save_as_name.strip(),
+            model="SDXL" if is_sdxl else "SD1.5", seed=final_seed,
+            loras=[name for name, _, _ in slots if name != "None"],
+            controlnet=bool(cn_info),
+            pos_chars=len(pos_text), neg_chars=len(neg_text),
+            resolution=[out_w, out_h], batch_size=batch_size,
+        )
 
         return (
             positive_cond, negative_cond, model, clip,
@@ -1335,14 +3300,9 @@ class CharacterCreatorProV10:
         )
 
     @classmethod
-    def IS_CHANGED(cls, *args, **kwargs):
-        """Hash all widget values — any change = re-run."""
-        import hashlib, json
-        try:
-            state = json.dumps(list(args) + sorted(kwargs.items()), sort_keys=True, default=str)
-        except Exception:
-            state = str(args) + str(kwargs)
-        return hashlib.sha256(state.encode()).hexdigest()
+    def IS_CHANGED(cls, **kwargs):
+        """Fingerprint of the effective character config + installed files."""
+        return character_fingerprint(kwargs)
 
 
 # ═══════════════════════════════════════════════════════════
@@ -1477,8 +3437,9 @@ class CharacterQuickPresetV3:
     OUTPUT_NODE  = False
 
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
-        lora_list = ["None"] + folder_paths.get_filename_list("loras")
+        lora_list = INPUT_SPEC_CACHE.lora_list()
         return {
             "required": {
                 "model":  ("MODEL",),
@@ -1508,6 +3469,7 @@ class CharacterQuickPresetV3:
 
     def load(self, model, clip, preset, lora_1, lora_1_model_str, lora_1_clip_str,
              append_positive="", append_negative=""):
+        timer = StageTimer("CharacterQuickPreset")
         cfg = dict(QUICK_PRESETS[preset])
 
         # Ensure all optional keys exist with safe defaults
@@ -1515,29 +3477,789 @@ class CharacterQuickPresetV3:
                     "extra_negative", "character_name"):
             cfg.setdefault(key, "")
 
-        pos_text = build_positive_prompt(cfg)
-        neg_text = build_negative_prompt(cfg)
+        pos_text = PROMPT_ENGINE.positive(cfg)
+        neg_text = PROMPT_ENGINE.negative(cfg)
 
         if append_positive.strip():
             pos_text += f", {append_positive.strip()}"
         if append_negative.strip():
             neg_text += f", {append_negative.strip()}"
+        timer.mark("prompts")
 
         # FIX: pass separate model/clip strengths
         model, clip = apply_lora(model, clip, lora_1, lora_1_model_str, lora_1_clip_str)
+        timer.mark("LoRA")
 
         pos_cond = encode_prompt(clip, pos_text)
         neg_cond = encode_prompt(clip, neg_text)
+        timer.mark("encode")
 
         info = (
             f"Preset: {preset} | "
             f"LoRA: {lora_1} [{lora_1_model_str}/{lora_1_clip_str}] | "
             f"+{len(pos_text)}c / -{len(neg_text)}c"
         )
+        if timer.enabled:
+            info += " | " + " · ".join(
+                f"{name} {sec * 1e3:.1f}ms" for name, sec in timer.stages
+            )
+            info += " | " + timer.cache_summary()
+        timer.log(
+            preset=preset, loras=[lora_1] if lora_1 != "None" else [],
+            pos_chars=len(pos_text), neg_chars=len(neg_text),
+        )
 
         return (pos_cond, neg_cond, model, clip, info)
 
 
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER BATCH NODE
+#  N characters → one batched CONDITIONING + [N, 4, h, w] latent,
+#  so the text encoder and the sampler each run once per roster.
+# ═══════════════════════════════════════════════════════════
+
+def parse_character_entries(presets: str, characters_json: str) -> list:
+    """Preset names (one per line) followed by entries of a JSON list."""
+    entries = [line.strip() for line in presets.splitlines() if line.strip()]
+    if characters_json.strip():
+        data = json.loads(characters_json)
+        if not isinstance(data, list):
+            raise ValueError("characters_json must be a JSON list")
+        entries.extend(data)
+    return entries
+
+
+class CharacterBatchV1:
+    """
+    Character Batch v1
+    ✦ Presets and/or a JSON list of character configs
+    ✦ One batched CLIP pass for all prompts (SD 1.5)
+    ✦ Batched CONDITIONING + matching [N, 4, h, w] latent
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro"
+    FUNCTION     = "batch"
+    RETURN_TYPES = ("CONDITIONING", "CONDITIONING", "LATENT", "INT", "INT", "STRING", "STRING")
+    RETURN_NAMES = ("positive",     "negative",     "latent", "width", "height", "labels", "debug")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "clip": ("CLIP",),
+                "presets": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": "اسم preset في كل سطر..."
+                }),
+                "characters_json": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": '[{"preset": "Aria", "expression": "😊 Warm Smile"}, ...]'
+                }),
+            }
+        }
+
+    def batch(self, clip, presets, characters_json):
+        entries = parse_character_entries(presets, characters_json)
+        if not entries:
+            raise ValueError("Character Batch: no characters given")
+        cfgs = [resolve_character_config(e) for e in entries]
+
+        is_sdxl = clip_family(clip).is_sdxl
+        prompts = [assemble_prompts(cfg, is_sdxl) for cfg in cfgs]
+        positive = encode_prompt_batch(clip, [p[0] for p in prompts])
+        negative = encode_prompt_batch(clip, [p[1] for p in prompts])
+
+        # One latent batch needs one resolution — the first character's
+        out_w, out_h = camera_resolution(cfgs[0].get("camera_angle", ""), is_sdxl)
+        latent_out = empty_latent(out_w, out_h, len(cfgs))
+
+        labels = [
+            cfg.get("character_name") or f"character_{i + 1:03d}"
+            for i, cfg in enumerate(cfgs)
+        ]
+        mismatched = [
+            label for label, cfg in zip(labels, cfgs)
+            if camera_resolution(cfg.get("camera_angle", ""), is_sdxl) != (out_w, out_h)
+        ]
+
+        debug = "\n".join(filter(None, [
+            "╔══ CHARACTER BATCH v10.1 ══╗",
+            f"  Characters : {len(cfgs)}",
+            f"  Res        : {out_w}x{out_h} ({'SDXL' if is_sdxl else 'SD1.5'})",
+            f"  Res ≠ batch: {', '.join(mismatched)}" if mismatched else "",
+            f"  Cond       : {tuple(positive[0][0].shape)} / {tuple(negative[0][0].shape)}",
+            "╚═══════════════════════════╝",
+        ]))
+        return (positive, negative, latent_out, out_w, out_h, "\n".join(labels), debug)
+
+
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER SWEEP NODE
+#  Contact sheets: one base character × one or two attribute axes.
+#  Items are grouped by camera resolution so each group shares one
+#  latent batch and one batched encode.
+# ═══════════════════════════════════════════════════════════
+
+SWEEP_AXES = {
+    "quality_preset": QUALITY_PRESETS,
+    "art_style":      ART_STYLES,
+    "gender":         GENDER_DATA,
+    "age_group":      AGE_DATA,
+    "body_type":      BODY_TYPES,
+    "ethnicity":      ETHNICITY_DATA,
+    "hair_style":     HAIR_STYLES,
+    "hair_color":     HAIR_COLORS,
+    "eye_style":      EYE_STYLES,
+    "eye_color":      EYE_COLORS,
+    "archetype":      ARCHETYPES,
+    "expression":     EXPRESSIONS,
+    "outfit":         OUTFITS,
+    "lighting":       LIGHTING,
+    "camera_angle":   CAMERA_ANGLES,
+    "background":     BACKGROUNDS,
+}
+
+
+def sweep_axis_values(axis: str, spec: str) -> list:
+    """
+    Table keys for one sweep axis. Empty spec = every entry; otherwise one
+    value per line, matched exactly or as a substring ("Warm Smile").
+    """
+    if axis == "None":
+        return [None]
+    keys = list(SWEEP_AXES[axis].keys())
+    wanted = [line.strip() for line in spec.splitlines() if line.strip()]
+    if not wanted:
+        return keys
+    values = []
+    for want in wanted:
+        match = want if want in keys else next((k for k in keys if want in k), None)
+        if match is None:
+            raise ValueError(f"Character Sweep: '{want}' is not a {axis} option")
+        values.append(match)
+    return values
+
+
+def build_sweep_items(base_cfg: dict, axis_1: str, values_1: list,
+                      axis_2: str, values_2: list) -> list:
+    """All axis combinations as (label, cfg) pairs, axis 1 outermost."""
+    base_label = safe_filename(base_cfg.get("character_name", "")) or "character"
+    items = []
+    for v1 in values_1:
+        for v2 in values_2:
+            cfg = dict(base_cfg)
+            label = [base_label]
+            for axis, value in ((axis_1, v1), (axis_2, v2)):
+                if value is not None:
+                    cfg[axis] = value
+                    label.append("_".join(safe_filename(value).split()))
+            items.append(("__".join(label), cfg))
+    return items
+
+
+class CharacterSweepV1:
+    """
+    Character Sweep v1
+    ✦ Base character (preset + JSON overrides) × up to two axes
+    ✦ Items grouped by camera resolution bucket
+    ✦ One batched encode + one latent batch per group (list outputs)
+    """
+
+    CATEGORY       = "🎨 Character Creator Pro"
+    FUNCTION       = "sweep"
+    RETURN_TYPES   = ("CONDITIONING", "CONDITIONING", "LATENT", "INT", "INT", "STRING", "STRING")
+    RETURN_NAMES   = ("positive",     "negative",     "latent", "width", "height", "labels", "debug")
+    OUTPUT_IS_LIST = (True, True, True, True, True, True, False)
+    OUTPUT_NODE    = False
+
+    @classmethod
+    @cached_input_types
+    def INPUT_TYPES(cls):
+        axes = list(SWEEP_AXES.keys())
+        return {
+            "required": {
+                "clip": ("CLIP",),
+                "load_preset": (list_character_presets() + list(QUICK_PRESETS.keys()),
+                                {"default": "None"}),
+                "base_config_json": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": '{"character_name": "Aria", "gender": "👩 Female"}'
+                }),
+                "axis_1":        (axes, {"default": "expression"}),
+                "axis_1_values": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": "فارغ = كل القيم"
+                }),
+                "axis_2":        (["None"] + axes, {"default": "camera_angle"}),
+                "axis_2_values": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": "فارغ = كل القيم"
+                }),
+            }
+        }
+
+    def sweep(self, clip, load_preset, base_config_json,
+              axis_1, axis_1_values, axis_2, axis_2_values):
+        base = {} if load_preset == "None" else {"preset": load_preset}
+        if base_config_json.strip():
+            base.update(json.loads(base_config_json))
+        base_cfg = resolve_character_config(base)
+
+        items = build_sweep_items(
+            base_cfg,
+            axis_1, sweep_axis_values(axis_1, axis_1_values),
+            axis_2, sweep_axis_values(axis_2, axis_2_values),
+        )
+
+        is_sdxl = clip_family(clip).is_sdxl
+        groups  = {}   # (w, h) -> [(label, cfg), ...] in sweep order
+        for label, cfg in items:
+            res = camera_resolution(cfg.get("camera_angle", ""), is_sdxl)
+            groups.setdefault(res, []).append((label, cfg))
+
+        positives, negatives, latents, widths, heights, labels = [], [], [], [], [], []
+        for (out_w, out_h), group in groups.items():
+            prompts = [assemble_prompts(cfg, is_sdxl) for _, cfg in group]
+            positives.append(encode_prompt_batch(clip, [p[0] for p in prompts]))
+            negatives.append(encode_prompt_batch(clip, [p[1] for p in prompts]))
+            latents.append(empty_latent(out_w, out_h, len(group)))
+            widths.append(out_w)
+            heights.append(out_h)
+            labels.append("\n".join(label for label, _ in group))
+
+        debug = "\n".join([
+            "╔══ CHARACTER SWEEP v10.1 ══╗",
+            f"  Base       : {load_preset}",
+            f"  Axes       : {axis_1} × {axis_2}",
+            f"  Items      : {len(items)} in {len(groups)} resolution group(s)",
+            *(f"  {f'{w}x{h}':<11}: {len(g)} item(s)" for (w, h), g in groups.items()),
+            "╚═══════════════════════════╝",
+        ])
+        return (positives, negatives, latents, widths, heights, labels, debug)
+
+
+# ═══════════════════════════════════════════════════════════
+#  STAGE NODES
+#  CharacterCreatorPro split into nodes ComfyUI can cache one by
+#  one — changing the background re-runs config → prompt → encode
+#  but not the LoRA stack:
+#
+#    Config ─ CHARACTER ─┬─ Prompt ─ CHARACTER_PROMPT ─ Encode
+#                        └─ Latent
+#    LoRAs (MODEL, CLIP) ───────────────────────── CLIP ─┘
+# ═══════════════════════════════════════════════════════════
+
+class CharacterConfigV1:
+    """
+    Character Config v1
+    ✦ Preset load / save + every character widget → CHARACTER
+    ✦ DNA seed and sampler recommendation
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro/Stages"
+    FUNCTION     = "configure"
+    RETURN_TYPES = ("CHARACTER", "INT",  "FLOAT", "INT",   "STRING")
+    RETURN_NAMES = ("character", "seed", "cfg",   "steps", "info")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    @cached_input_types
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                **_preset_inputs(),
+                **_appearance_inputs(),
+                **_seed_inputs(),
+                **_detail_inputs(),
+            }
+        }
+
+    def configure(self, load_preset, save_as_name, base_seed, use_char_seed, **widgets):
+        cfg = resolve_character(load_preset, widgets)
+        final_seed = final_character_seed(cfg, base_seed, use_char_seed)
+        save_status = save_character(save_as_name, cfg)
+        _, _, rec_steps, rec_cfg = get_sampler_preset(cfg["art_style"])
+        info = (
+            f"{cfg['character_name'] or '—'} | Preset: {load_preset} | "
+            f"Save: {save_status} | Seed: {final_seed}"
+        )
+        return (cfg, final_seed, rec_cfg, rec_steps, info)
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return character_fingerprint(kwargs)
+
+
+class CharacterPromptV1:
+    """
+    Character Prompt v1
+    ✦ CHARACTER → weighted positive / negative + installed embeddings
+    ✦ Optional token budget (needs the CLIP tokenizer)
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro/Stages"
+    FUNCTION     = "build"
+    RETURN_TYPES = ("CHARACTER_PROMPT", "STRING",        "STRING")
+    RETURN_NAMES = ("prompt",           "positive_text", "negative_text")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "clip":      ("CLIP",),
+                "character": ("CHARACTER",),
+                **_token_budget_input(),
+            }
+        }
+
+    def build(self, clip, character, token_budget):
+        is_sdxl = clip_family(clip).is_sdxl
+        prompts = assemble_prompts(character, is_sdxl, clip, token_budget)
+        return (prompts, prompts.positive, prompts.negative)
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """Re-run only when the installed embeddings change."""
+        return EMBEDDING_INVENTORY.version()
+
+
+class CharacterLorasV1:
+    """
+    Character LoRAs v1
+    ✦ The three LoRA slots of CharacterCreatorPro on their own
+    ✦ Optional LORA_STACK for any further LoRAs
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro/Stages"
+    FUNCTION     = "apply"
+    RETURN_TYPES = ("MODEL", "CLIP")
+    RETURN_NAMES = ("model", "clip")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    @cached_input_types
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "model": ("MODEL",),
+                "clip":  ("CLIP",),
+                **_lora_inputs(),
+            },
+            "optional": _lora_stack_input(),
+        }
+
+    def apply(self, model, clip, lora_stack=None, **slots):
+        stack = lora_slots(slots) + lora_stack_entries(lora_stack)
+        return apply_lora_slots(model, clip, stack)
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """Re-run when a selected LoRA file is replaced on disk."""
+        stack = lora_slots(kwargs) + lora_stack_entries(kwargs.get("lora_stack"))
+        return repr([
+            _file_version("loras", name)
+            for name, _, _ in stack if name != "None"
+        ])
+
+
+class CharacterLoraStackV1:
+    """
+    Character LoRA Stack v1
+    ✦ Appends one LoRA to a LORA_STACK — chain as many as needed
+    ✦ Feeds lora_stack on CharacterCreatorPro / Character LoRAs
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro"
+    FUNCTION     = "stack"
+    RETURN_TYPES = ("LORA_STACK",)
+    RETURN_NAMES = ("lora_stack",)
+    OUTPUT_NODE  = False
+
+    @classmethod
+    @cached_input_types
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "lora_name":      (INPUT_SPEC_CACHE.lora_list(), {"default": "None"}),
+                "strength_model": _lora_strength_input(1.0),
+                "strength_clip":  _lora_strength_input(1.0),
+            },
+            "optional": _lora_stack_input(),
+        }
+
+    def stack(self, lora_name, strength_model, strength_clip, lora_stack=None):
+        entries = lora_stack_entries(lora_stack)
+        if lora_name != "None":
+            entries.append((lora_name, strength_model, strength_clip))
+        return (entries,)
+
+
+class CharacterEncodeV1:
+    """
+    Character Encode v1
+    ✦ CHARACTER_PROMPT → positive / negative CONDITIONING (cached)
+    ✦ ControlNet optional input
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro/Stages"
+    FUNCTION     = "encode"
+    RETURN_TYPES = ("CONDITIONING", "CONDITIONING")
+    RETURN_NAMES = ("positive",     "negative")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "clip":   ("CLIP",),
+                "prompt": ("CHARACTER_PROMPT",),
+                **_controlnet_strength_input(),
+            },
+            "optional": {
+                **_controlnet_inputs(),
+                # From Character Latent: the hint is prepared at this size
+                "width":  ("INT", {"forceInput": True}),
+                "height": ("INT", {"forceInput": True}),
+            },
+        }
+
+    def check_lazy_status(self, **kwargs):
+        return controlnet_lazy_status(kwargs)
+
+    def encode(self, clip, prompt, controlnet_strength,
+               controlnet=None, controlnet_image=None, width=None, height=None):
+        positive, negative = encode_character_prompts(clip, prompt)
+        return apply_character_controlnet(
+            positive, negative, controlnet, controlnet_image,
+            controlnet_strength, width, height,
+        )
+
+
+class CharacterLatentV1:
+    """
+    Character Latent v1
+    ✦ Camera-aware resolution for the model family + empty latent
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro/Stages"
+    FUNCTION     = "latent"
+    RETURN_TYPES = ("LATENT", "INT",   "INT")
+    RETURN_NAMES = ("latent", "width", "height")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "clip":      ("CLIP",),
+                "character": ("CHARACTER",),
+                **_latent_inputs(),
+            },
+            "optional": {
+                "model": ("MODEL",),   # only for latent_dtype = model
+            }
+        }
+
+    def latent(self, clip, character, batch_size=1,
+               latent_device="cpu", latent_dtype="float32", model=None):
+        out_w, out_h = camera_resolution(
+            character.get("camera_angle", ""), clip_family(clip).is_sdxl
+        )
+        latent_out = empty_latent(out_w, out_h, batch_size, latent_device, latent_dtype, model)
+        return (latent_out, out_w, out_h)
+
+
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER SERIES NODE
+#  N variants of one character in a single sampler call: the prompts
+#  are encoded once and broadcast over an [N, C, h, w] latent, and each
+#  image gets its own seed derived from the DNA seed (series_seeds).
+# ═══════════════════════════════════════════════════════════
+
+class SeriesNoise:
+    """
+    NOISE for SamplerCustomAdvanced with one seed per batch item — item i
+    gets exactly the noise a single-image run with seeds[i] gets, so any
+    image of the series can be re-rendered on its own.
+    """
+
+    def __init__(self, seeds: list):
+        self.seeds = list(seeds)
+        self.seed  = self.seeds[0]
+
+    def generate_noise(self, input_latent):
+        import torch
+        import comfy.sample
+        samples = input_latent["samples"]
+        return torch.cat([
+            comfy.sample.prepare_noise(samples[i:i + 1], self.seeds[i % len(self.seeds)])
+            for i in range(samples.shape[0])
+        ])
+
+
+def repeat_conditioning(cond: list, count: int) -> list:
+    """CONDITIONING broadcast to a batch of count — expanded views, no copy."""
+    out = []
+    for tensor, extras in cond:
+        extras = dict(extras)
+        pooled = extras.get("pooled_output")
+        if pooled is not None and pooled.shape[0] == 1:
+            extras["pooled_output"] = pooled.expand(count, *pooled.shape[1:])
+        if tensor.shape[0] == 1:
+            tensor = tensor.expand(count, *tensor.shape[1:])
+        out.append([tensor, extras])
+    return out
+
+
+def series_latent(latent: dict, count: int) -> dict:
+    """[count, C, h, w] latent from the first item of latent."""
+    samples = latent["samples"][:1]
+    out = {k: v for k, v in latent.items() if k not in ("samples", "batch_index")}
+    out["samples"] = samples.repeat(count, *[1] * (samples.dim() - 1))
+    return out
+
+
+class CharacterSeriesV1:
+    """
+    Character Series v1
+    ✦ One character → N DNA-seeded variants in one batched execution
+    ✦ Conditioning broadcast over the batch, never re-encoded
+    ✦ NOISE output (one seed per image) for SamplerCustomAdvanced
+    ✦ Seed list output to reproduce single images later
+    """
+
+    CATEGORY       = "🎨 Character Creator Pro"
+    FUNCTION       = "series"
+    RETURN_TYPES   = ("CONDITIONING", "CONDITIONING", "LATENT", "NOISE", "INT",   "STRING")
+    RETURN_NAMES   = ("positive",     "negative",     "latent", "noise", "seeds", "seed_list")
+    OUTPUT_IS_LIST = (False,          False,          False,    False,   True,    False)
+    OUTPUT_NODE    = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "positive": ("CONDITIONING",),
+                "negative": ("CONDITIONING",),
+                "latent":   ("LATENT",),
+                "seed":     ("INT", {"forceInput": True}),
+                "series_size": ("INT", {"default": 16, "min": 1, "max": 64}),
+            }
+        }
+
+    def series(self, positive, negative, latent, seed, series_size):
+        seeds = series_seeds(seed, series_size)
+        return (
+            repeat_conditioning(positive, series_size),
+            repeat_conditioning(negative, series_size),
+            series_latent(latent, series_size),
+            SeriesNoise(seeds),
+            seeds,
+            ", ".join(str(s) for s in seeds),
+        )
+
+
+# ═══════════════════════════════════════════════════════════
+#  CHARACTER ROSTER NODE
+#  Renders a roster one character per queue run. While the current
+#  image samples, a background thread warms the caches the next
+#  character's text side reads: its preset (PresetStore), its LoRA
+#  files (LORA_CACHE) and the embedding inventory. Prefetch is best
+#  effort: a run waits at most CCP_ROSTER_WAIT_MS (default 50) for it
+#  and then loads whatever is still cold itself, so a slow disk never
+#  stalls ComfyUI's execution thread.
+# ═══════════════════════════════════════════════════════════
+
+class RosterPrefetcher:
+    """
+    One background thread, one pending request (latest wins).
+    prefetch() returns immediately; wait() blocks until idle.
+    """
+
+    def __init__(self):
+        self.prefetched = 0
+        self.errors     = 0
+        self._next      = None    # entry waiting to be prefetched
+        self._busy      = False
+        self._cond      = threading.Condition()
+        self._thread    = None
+
+    def prefetch(self, entry):
+        with self._cond:
+            self._next = entry
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ccp-roster-prefetch", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until no prefetch is queued or running."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._next is None and not self._busy, timeout
+            )
+
+    def _warm(self, entry):
+        cfg = resolve_character_config(entry)
+        if isinstance(entry, str) or entry.get("preset"):
+            PRESET_STORE.version(entry if isinstance(entry, str) else entry["preset"])
+        for name, _, _ in lora_stack_entries(cfg.get("loras")):
+            path = folder_paths.get_full_path("loras", name)
+            if path is not None:
+                load_lora_weights(path)
+        EMBEDDING_INVENTORY.version()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._next is not None)
+                entry, self._next, self._busy = self._next, None, True
+            try:
+                self._warm(entry)
+                self.prefetched += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"[CharacterCreator] ⚠️  Roster prefetch error: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+ROSTER_PREFETCHER = RosterPrefetcher()
+ROSTER_WAIT_S     = _env_int("CCP_ROSTER_WAIT_MS", 50) / 1e3
+
+
+def parse_roster_filter(spec: str) -> tuple:
+    """
+    "gender=👩 Female; hero_*" → ({"gender": "👩 Female"}, ["hero_*"]).
+    column=value terms use PresetStore.INDEXED columns; other terms are
+    name globs (any may match). Terms are split on ";" or new lines.
+    """
+    columns, patterns = {}, []
+    for term in spec.replace("\n", ";").split(";"):
+        term = term.strip()
+        if not term:
+            continue
+        key, sep, value = term.partition("=")
+        if sep and key.strip() in PresetStore.INDEXED:
+            columns[key.strip()] = value.strip()
+        else:
+            patterns.append(term)
+    return columns, patterns
+
+
+def _entry_name(entry) -> str:
+    if isinstance(entry, str):
+        return entry
+    return str(entry.get("preset") or entry.get("character_name") or "")
+
+
+def roster_entries(presets: str, characters_json: str, roster_filter: str) -> list:
+    """
+    Batch-style entries (preset names + JSON list) — or, when both are
+    empty, every saved preset matching the filter's column terms —
+    narrowed to the names matching the filter's globs.
+    """
+    import fnmatch
+    columns, patterns = parse_roster_filter(roster_filter)
+    entries = parse_character_entries(presets, characters_json)
+    if not entries:
+        entries = PRESET_STORE.query(**columns)
+    if patterns:
+        entries = [
+            e for e in entries
+            if any(fnmatch.fnmatchcase(_entry_name(e), p) for p in patterns)
+        ]
+    return entries
+
+
+class CharacterRosterV1:
+    """
+    Character Roster v1
+    ✦ Presets / JSON characters / a preset filter → one character per run
+    ✦ Cursor advances every queue run, wraps at the end
+    ✦ Prefetches the next character's preset, LoRAs and embeddings
+      in the background while the current one samples
+    """
+
+    CATEGORY     = "🎨 Character Creator Pro"
+    FUNCTION     = "next_character"
+    RETURN_TYPES = ("CHARACTER", "LORA_STACK", "INT",  "STRING", "INT",   "INT",   "STRING")
+    RETURN_NAMES = ("character", "lora_stack", "seed", "name",   "index", "count", "info")
+    OUTPUT_NODE  = False
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "presets": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": "اسم preset في كل سطر (فارغ = كل المحفوظات)"
+                }),
+                "characters_json": ("STRING", {
+                    "default": "", "multiline": True,
+                    "placeholder": '[{"preset": "Aria", "loras": [["face.safetensors", 0.8, 0.8]]}, ...]'
+                }),
+                "roster_filter": ("STRING", {
+                    "default": "", "placeholder": "gender=👩 Female; hero_*"
+                }),
+                "start_index": ("INT", {"default": 0, "min": 0, "max": 0xFFFF}),
+                **_seed_inputs(),
+            }
+        }
+
+    def __init__(self):
+        self._signature = None
+        self._cursor    = 0
+
+    def next_character(self, presets, characters_json, roster_filter, start_index,
+                       base_seed, use_char_seed):
+        timer = StageTimer("CharacterRoster")
+        ROSTER_PREFETCHER.wait(timeout=ROSTER_WAIT_S)
+        timer.mark("prefetch wait")
+
+        entries = roster_entries(presets, characters_json, roster_filter)
+        if not entries:
+            raise ValueError("Character Roster: no characters match")
+        signature = (presets, characters_json, roster_filter, start_index)
+        if signature != self._signature:
+            self._signature, self._cursor = signature, start_index
+        index = self._cursor % len(entries)
+        self._cursor = index + 1
+
+        entry = entries[index]
+        cfg = resolve_character_config(entry)
+        cfg.setdefault("character_name", _entry_name(entry))
+        stack = lora_stack_entries(cfg.get("loras"))
+        seed = final_character_seed(cfg, base_seed, use_char_seed)
+        timer.mark("resolve")
+
+        ROSTER_PREFETCHER.prefetch(entries[(index + 1) % len(entries)])
+
+        name = cfg.get("character_name") or _entry_name(entry)
+        info = (
+            f"{index + 1}/{len(entries)} {name} | Seed: {seed} | "
+            f"LoRAs: {len(stack)} | Next: {_entry_name(entries[(index + 1) % len(entries)])}"
+        )
+        if timer.enabled:
+            info += " | " + " · ".join(
+                f"{stage} {sec * 1e3:.1f}ms" for stage, sec in timer.stages
+            )
+        timer.log(character=name, index=index, count=len(entries), seed=seed,
+                  loras=[n for n, _, _ in stack])
+        return (cfg, stack, seed, name, index, len(entries), info)
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """Always re-run — every run advances the cursor."""
+        return float("nan")
+
+
 # ═══════════════════════════════════════════════════════════
 #  REGISTRATION
 # ═══════════════════════════════════════════════════════════
@@ -1545,13 +4267,38 @@ class CharacterQuickPresetV3:
 NODE_CLASS_MAPPINGS = {
     "CharacterCreatorPro":  CharacterCreatorProV10,
     "CharacterQuickPreset": CharacterQuickPresetV3,
+    "CharacterBatch":       CharacterBatchV1,
+    "CharacterSweep":       CharacterSweepV1,
+    "CharacterConfig":      CharacterConfigV1,
+    "CharacterPrompt":      CharacterPromptV1,
+    "CharacterLoras":       CharacterLorasV1,
+    "CharacterLoraStack":   CharacterLoraStackV1,
+    "CharacterSeries":      CharacterSeriesV1,
+    "CharacterRoster":      CharacterRosterV1,
+    "CharacterEncode":      CharacterEncodeV1,
+    "CharacterLatent":      CharacterLatentV1,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "CharacterCreatorPro":  "🎨 Character Creator Pro v10.1",
     "CharacterQuickPreset": "⚡ Character Quick Preset v10.1",
+    "CharacterBatch":       "👥 Character Batch v10.1",
+    "CharacterSweep":       "🧮 Character Sweep v10.1",
+    "CharacterConfig":      "🧬 Character Config v10.1",
+    "CharacterPrompt":      "📝 Character Prompt v10.1",
+    "CharacterLoras":       "🧩 Character LoRAs v10.1",
+    "CharacterLoraStack":   "📚 Character LoRA Stack v10.1",
+    "CharacterSeries":      "🎞️ Character Series v10.1",
+    "CharacterRoster":      "📋 Character Roster v10.1",
+    "CharacterEncode":      "🔤 Character Encode v10.1",
+    "CharacterLatent":      "🖼️ Character Latent v10.1",
 }
 
+try:
+    _register_routes()
+except Exception as e:
+    print(f"[CharacterCreator] ⚠️  Route registration error: {e}")
+
 # ─────────────────────────────────────────────────────────
 #  __init__.py content (place in same folder as this file):
 #